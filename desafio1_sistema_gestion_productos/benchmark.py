@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from main import FORMATOS, Inventario, ProductoElectronico, ProductoAlimenticio
+
+class _ProductoElectronicoConDict:
+    def __init__(self, nombre, precio, cantidad, marca, garantia):
+        self.nombre = nombre
+        self.precio = precio
+        self.cantidad = cantidad
+        self.marca = marca
+        self.garantia = garantia
+
+class _ProductoAlimenticioConDict:
+    def __init__(self, nombre, precio, cantidad, fecha_caducidad):
+        self.nombre = nombre
+        self.precio = precio
+        self.cantidad = cantidad
+        self.fecha_caducidad = fecha_caducidad
+
+def _crear_productos(n, electronico, alimenticio):
+    productos = []
+    for i in range(n):
+        if i % 2:
+            productos.append(electronico(f"producto{i}", float(i), i, f"marca{i % 50}", 12))
+        else:
+            productos.append(alimenticio(f"producto{i}", float(i), i, "2025-01-01"))
+    return productos
+
+def _medir_memoria(n, electronico, alimenticio):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    productos = _crear_productos(n, electronico, alimenticio)
+    segundos = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del productos
+    return memoria, segundos
+
+def benchmark_memoria(n=200_000):
+    print(f"Memoria de {n} productos")
+    base, base_segundos = _medir_memoria(n, _ProductoElectronicoConDict, _ProductoAlimenticioConDict)
+    slots, slots_segundos = _medir_memoria(n, ProductoElectronico, ProductoAlimenticio)
+    print(f"  con __dict__:  {base / 2**20:8.1f} MiB ({base / n:.0f} B/producto), {base_segundos:.3f} s")
+    print(f"  con __slots__: {slots / 2**20:8.1f} MiB ({slots / n:.0f} B/producto), {slots_segundos:.3f} s")
+    print(f"  ahorro: {100 * (1 - slots / base):.1f}%")
+
+def _medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+def benchmark_lotes(n=200_000, cambios=50_000):
+    productos = _crear_productos(n, ProductoElectronico, ProductoAlimenticio)
+    actualizaciones = [(f"producto{i}", {"precio": i * 1.1, "cantidad": i + 1}) for i in range(0, n, n // cambios)]
+    eliminados = [nombre for nombre, _ in actualizaciones]
+
+    def uno_a_uno(inventario):
+        for producto in productos:
+            inventario.agregar_producto(producto)
+        for nombre, valores in actualizaciones:
+            inventario.actualizar_producto(nombre, **valores)
+        for nombre in eliminados:
+            inventario.eliminar_producto(nombre)
+
+    def en_lote(inventario):
+        inventario.agregar_productos(productos)
+        inventario.actualizar_productos(actualizaciones)
+        inventario.eliminar_productos(eliminados)
+
+    print(f"{n} altas, {len(actualizaciones)} actualizaciones y {len(eliminados)} bajas")
+    for indices in ((), ('marca', 'fecha_caducidad')):
+        individual = _medir(uno_a_uno, Inventario(indices=indices))
+        lote = _medir(en_lote, Inventario(indices=indices))
+        print(f"  índices {indices or '-'}: uno a uno {individual:.3f} s, en lote {lote:.3f} s ({individual / lote:.2f}x)")
+
+def benchmark_formatos(n=200_000):
+    inventario = Inventario()
+    inventario.agregar_productos(_crear_productos(n, ProductoElectronico, ProductoAlimenticio))
+    esperado = [p.to_dict() for p in inventario.productos]
+    print(f"Guardar y cargar {n} productos")
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato in FORMATOS:
+            filename = os.path.join(directorio, f"inventario.{formato}")
+            guardar = _medir(inventario.guardar_en_json, filename)
+            copia = Inventario()
+            cargar = _medir(lambda: copia.cargar_desde_json(filename, formato=formato))
+            if [p.to_dict() for p in copia.productos] != esperado:
+                raise AssertionError(f"El formato {formato} no conserva los datos")
+            tamano = os.path.getsize(filename)
+            print(f"  {formato:8} {tamano / 2**20:7.1f} MiB, guardar {n / guardar:10.0f} reg/s, cargar {n / cargar:10.0f} reg/s")
+
+BENCHMARKS = {
+    'memoria': benchmark_memoria,
+    'lotes': benchmark_lotes,
+    'formatos': benchmark_formatos,
+}
+
+if __name__ == "__main__":
+    for nombre in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[nombre]()
@@ -1,68 +1,597 @@
+import argparse
+import inspect
 import json
+import marshal
+import math
+import mmap
+import operator
+import os
+import pickle
+import re
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from functools import lru_cache, wraps
+
+FORMATOS_FECHA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d")
+
+@lru_cache(maxsize=4096)
+def parsear_fecha(texto):
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto.strip(), formato).date()
+        except ValueError:
+            pass
+    return None
+
+FORMATOS = {
+    'json': (lambda registros: json.dumps(registros).encode(), json.loads),
+    'pickle': (lambda registros: pickle.dumps(registros, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    'marshal': (marshal.dumps, marshal.loads),
+}
+
+EXTENSIONES = {'.json': 'json', '.pickle': 'pickle', '.pkl': 'pickle', '.marshal': 'marshal'}
+
+def formato_de(filename, formato=None):
+    if formato is None:
+        formato = EXTENSIONES.get(os.path.splitext(filename)[1], 'json')
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    return formato
+
+def escribir_registros(filename, registros, formato=None):
+    volcar, _ = FORMATOS[formato_de(filename, formato)]
+    temporal = filename + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(volcar(registros))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, filename)
+
+def leer_registros(filename, formato=None):
+    if formato is None and formato_de(filename) == 'pickle':
+        raise ValueError("Un archivo pickle puede ejecutar código al cargarse; indique formato='pickle' explícitamente")
+    formato = formato_de(filename, formato)
+    _, cargar = FORMATOS[formato]
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        if formato == 'json':
+            return cargar(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return cargar(datos)
+
+CUBETAS_POR_OCTAVA = 4
+
+class Instrumentacion:
+    def __init__(self, clases, funciones=(), espacio=None):
+        self.clases = clases
+        self.funciones = funciones
+        self.espacio = espacio
+        self._originales = []
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    @property
+    def activa(self):
+        return bool(self._originales)
+
+    def reiniciar(self):
+        self.metodos = {}
+        self.objetos = {}
+
+    def activar(self):
+        if self._originales:
+            return
+        for clase in self.clases:
+            for nombre, funcion in list(vars(clase).items()):
+                if nombre == '__init__':
+                    envoltura = self._contar_objetos(clase, funcion)
+                elif nombre.startswith('_') or not _es_medible(funcion):
+                    continue
+                else:
+                    envoltura = self._medir(f"{clase.__name__}.{nombre}", funcion)
+                self._originales.append((clase, nombre, funcion))
+                setattr(clase, nombre, envoltura)
+        for nombre in self.funciones:
+            funcion = self.espacio[nombre]
+            self._originales.append((self.espacio, nombre, funcion))
+            self.espacio[nombre] = self._medir(nombre, funcion)
+
+    def desactivar(self):
+        while self._originales:
+            destino, nombre, funcion = self._originales.pop()
+            if isinstance(destino, dict):
+                destino[nombre] = funcion
+            else:
+                setattr(destino, nombre, funcion)
+
+    def _medir(self, nombre, funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self._anotar(nombre, time.perf_counter_ns() - inicio)
+        return envoltura
+
+    def _contar_objetos(self, clase, funcion):
+        @wraps(funcion)
+        def envoltura(objeto, *args, **kwargs):
+            funcion(objeto, *args, **kwargs)
+            if type(objeto) is clase:
+                with self._candado:
+                    self.objetos[clase.__name__] = self.objetos.get(clase.__name__, 0) + 1
+        return envoltura
+
+    def _anotar(self, nombre, nanosegundos):
+        cubeta = int(math.log2(nanosegundos) * CUBETAS_POR_OCTAVA) if nanosegundos > 0 else 0
+        with self._candado:
+            estadistica = self.metodos.get(nombre)
+            if estadistica is None:
+                estadistica = self.metodos[nombre] = {'llamadas': 0, 'total_ns': 0, 'max_ns': 0, 'cubetas': {}}
+            estadistica['llamadas'] += 1
+            estadistica['total_ns'] += nanosegundos
+            estadistica['max_ns'] = max(estadistica['max_ns'], nanosegundos)
+            estadistica['cubetas'][cubeta] = estadistica['cubetas'].get(cubeta, 0) + 1
+
+    def percentil(self, nombre, p):
+        estadistica = self.metodos[nombre]
+        objetivo = estadistica['llamadas'] * p / 100
+        acumuladas = 0
+        for cubeta, llamadas in sorted(estadistica['cubetas'].items()):
+            acumuladas += llamadas
+            if acumuladas >= objetivo:
+                return min(2 ** ((cubeta + 1) / CUBETAS_POR_OCTAVA), estadistica['max_ns']) / 1000
+        return estadistica['max_ns'] / 1000
+
+    def reporte(self, percentiles=(50, 90, 99)):
+        metodos = {}
+        for nombre, estadistica in sorted(self.metodos.items(), key=lambda e: -e[1]['total_ns']):
+            metodos[nombre] = {
+                'llamadas': estadistica['llamadas'],
+                'total_ms': round(estadistica['total_ns'] / 1e6, 3),
+                **{f"p{p}_us": round(self.percentil(nombre, p), 2) for p in percentiles},
+                'max_us': round(estadistica['max_ns'] / 1000, 2),
+            }
+        return {'metodos': metodos, 'objetos': dict(self.objetos)}
+
+def _es_medible(funcion):
+    return (
+        inspect.isfunction(funcion)
+        and not inspect.isgeneratorfunction(funcion)
+        and not getattr(funcion, '__isabstractmethod__', False)
+    )
 
 class Producto(ABC):
+    __slots__ = ('nombre', 'precio', 'cantidad')
+
     def __init__(self, nombre, precio, cantidad):
         self.nombre = nombre
         self.precio = precio
         self.cantidad = cantidad
 
+    def to_dict(self):
+        return {"nombre": self.nombre, "precio": self.precio, "cantidad": self.cantidad}
+
     @abstractmethod
     def descripcion(self):
         pass
 
 class ProductoElectronico(Producto):
+    __slots__ = ('marca', 'garantia')
+
     def __init__(self, nombre, precio, cantidad, marca, garantia):
         super().__init__(nombre, precio, cantidad)
         self.marca = marca
         self.garantia = garantia
 
+    def to_dict(self):
+        return {**super().to_dict(), "marca": self.marca, "garantia": self.garantia}
+
     def descripcion(self):
         return f"Producto electrónico: {self.nombre}, Marca: {self.marca}, Garantía: {self.garantia} meses"
 
 class ProductoAlimenticio(Producto):
+    __slots__ = ('fecha_caducidad',)
+
     def __init__(self, nombre, precio, cantidad, fecha_caducidad):
         super().__init__(nombre, precio, cantidad)
         self.fecha_caducidad = fecha_caducidad
 
+    def to_dict(self):
+        return {**super().to_dict(), "fecha_caducidad": self.fecha_caducidad}
+
     def descripcion(self):
         return f"Producto alimenticio: {self.nombre}, Fecha de caducidad: {self.fecha_caducidad}"
 
 class Inventario:
-    def __init__(self):
-        self.productos = []
+    def __init__(self, indices=(), umbral_compactacion=10000):
+        self._productos = {}
+        self._indices = {campo: {} for campo in indices}
+        self._columnas = None
+        self._registro = None
+        self._ruta_registro = None
+        self._formato_registro = None
+        self._entradas_registro = 0
+        self.umbral_compactacion = umbral_compactacion
+
+    @property
+    def productos(self):
+        return tuple(self._productos.values())
+
+    @productos.setter
+    def productos(self, productos):
+        registro, self._registro = self._registro, None
+        anterior = self._estado()
+        try:
+            self._vaciar()
+            for producto in productos:
+                self.agregar_producto(producto)
+        except Exception:
+            self._restaurar(anterior)
+            raise
+        finally:
+            self._registro = registro
+        if registro is not None:
+            self.compactar()
+
+    def _vaciar(self):
+        self._productos = {}
+        self._columnas = None
+        self._indices = {campo: {} for campo in self._indices}
+
+    def _estado(self):
+        return self._productos, self._indices, self._columnas
+
+    def _restaurar(self, estado):
+        self._productos, self._indices, self._columnas = estado
+
+    def _indexar(self, producto):
+        self._columnas = None
+        for campo, indice in self._indices.items():
+            valor = getattr(producto, campo, None)
+            if valor is not None:
+                indice.setdefault(valor, {})[producto.nombre] = producto
+
+    def _desindexar(self, producto):
+        self._columnas = None
+        for campo, indice in self._indices.items():
+            valor = getattr(producto, campo, None)
+            grupo = indice.get(valor)
+            if grupo is not None:
+                grupo.pop(producto.nombre, None)
+                if not grupo:
+                    del indice[valor]
+
+    def _validar_cambios(self, producto, cambios):
+        campos = {campo for clase in type(producto).__mro__ for campo in getattr(clase, '__slots__', ())}
+        campos.discard('nombre')
+        invalidos = sorted(set(cambios) - campos)
+        if invalidos:
+            raise ValueError(f"Campo no válido para {producto.nombre}: {', '.join(invalidos)}")
 
     def agregar_producto(self, producto):
-        self.productos.append(producto)
+        if producto.nombre in self._productos:
+            raise ValueError(f"Ya existe un producto llamado {producto.nombre}")
+        self._productos[producto.nombre] = producto
+        self._indexar(producto)
+        if self._registro is not None:
+            self._registrar({'op': 'agregar', 'producto': producto.to_dict()})
 
     def eliminar_producto(self, nombre):
-        self.productos = [p for p in self.productos if p.nombre != nombre]
+        producto = self._productos.pop(nombre, None)
+        if producto is not None:
+            self._desindexar(producto)
+            if self._registro is not None:
+                self._registrar({'op': 'eliminar', 'nombre': nombre})
+        return producto is not None
 
     def actualizar_producto(self, nombre, **kwargs):
-        for producto in self.productos:
-            if producto.nombre == nombre:
-                for key, value in kwargs.items():
-                    setattr(producto, key, value)
+        producto = self._productos.get(nombre)
+        if producto is None:
+            return False
+        self._validar_cambios(producto, kwargs)
+        self._desindexar(producto)
+        for key, value in kwargs.items():
+            setattr(producto, key, value)
+        self._indexar(producto)
+        if self._registro is not None:
+            self._registrar({'op': 'actualizar', 'nombre': nombre, 'cambios': kwargs})
+        return True
+
+    def agregar_productos(self, productos):
+        resultados = []
+        entradas = []
+        registrar = self._registro is not None
+        for producto in productos:
+            if producto.nombre in self._productos:
+                resultados.append(False)
+                continue
+            self._productos[producto.nombre] = producto
+            self._indexar(producto)
+            if registrar:
+                entradas.append({'op': 'agregar', 'producto': producto.to_dict()})
+            resultados.append(True)
+        self._registrar(*entradas)
+        return resultados
+
+    def eliminar_productos(self, nombres):
+        resultados = []
+        entradas = []
+        registrar = self._registro is not None
+        for nombre in nombres:
+            producto = self._productos.pop(nombre, None)
+            if producto is None:
+                resultados.append(False)
+                continue
+            self._desindexar(producto)
+            if registrar:
+                entradas.append({'op': 'eliminar', 'nombre': nombre})
+            resultados.append(True)
+        self._registrar(*entradas)
+        return resultados
+
+    def actualizar_productos(self, cambios):
+        resultados = []
+        entradas = []
+        registrar = self._registro is not None
+        for nombre, valores in cambios:
+            producto = self._productos.get(nombre)
+            if producto is None:
+                resultados.append(False)
+                continue
+            try:
+                self._validar_cambios(producto, valores)
+            except ValueError:
+                resultados.append(False)
+                continue
+            self._desindexar(producto)
+            for key, value in valores.items():
+                setattr(producto, key, value)
+            self._indexar(producto)
+            if registrar:
+                entradas.append({'op': 'actualizar', 'nombre': nombre, 'cambios': valores})
+            resultados.append(True)
+        self._registrar(*entradas)
+        return resultados
 
     def buscar_producto(self, nombre):
-        return next((p for p in self.productos if p.nombre == nombre), None)
+        return self._productos.get(nombre)
 
-    def guardar_en_json(self, filename):
-        with open(filename, 'w') as f:
-            json.dump([p.__dict__ for p in self.productos], f)
+    def buscar_por(self, campo, valor):
+        if campo not in self._indices:
+            raise ValueError(f"No hay un índice sobre {campo}")
+        return list(self._indices[campo].get(valor, {}).values())
 
-    def cargar_desde_json(self, filename):
+    def _obtener_columnas(self):
+        if self._columnas is None:
+            productos = self.productos
+            valores = array('d', map(operator.mul, (p.precio for p in productos), (p.cantidad for p in productos)))
+            vencimientos = sorted(
+                (fecha.toordinal(), i)
+                for i, fecha in enumerate(parsear_fecha(p.fecha_caducidad) if isinstance(p, ProductoAlimenticio) else None for p in productos)
+                if fecha is not None
+            )
+            self._columnas = {
+                'productos': productos,
+                'valores': valores,
+                'ordinales': array('l', (o for o, _ in vencimientos)),
+                'posiciones': array('l', (i for _, i in vencimientos)),
+            }
+        return self._columnas
+
+    def valor_total(self):
+        columnas = self._obtener_columnas()
+        if 'valor_total' not in columnas:
+            columnas['valor_total'] = math.fsum(columnas['valores'])
+        return columnas['valor_total']
+
+    def valor_por_marca(self):
+        columnas = self._obtener_columnas()
+        if 'valor_por_marca' not in columnas:
+            por_marca = {}
+            for producto, valor in zip(columnas['productos'], columnas['valores']):
+                if isinstance(producto, ProductoElectronico):
+                    por_marca[producto.marca] = por_marca.get(producto.marca, 0.0) + valor
+            columnas['valor_por_marca'] = por_marca
+        return dict(columnas['valor_por_marca'])
+
+    def proximos_a_vencer(self, dias, hoy=None):
+        columnas = self._obtener_columnas()
+        desde = (hoy or date.today()).toordinal()
+        ordinales = columnas['ordinales']
+        inicio = bisect_left(ordinales, desde)
+        fin = bisect_right(ordinales, desde + dias)
+        productos = columnas['productos']
+        return [productos[i] for i in columnas['posiciones'][inicio:fin]]
+
+    def abrir_registro(self, filename, formato=None):
+        self.cerrar_registro()
+        if os.path.exists(filename) or os.path.exists(filename + '.log'):
+            self.cargar_desde_json(filename, formato=formato)
+        else:
+            self._vaciar()
+        self._ruta_registro = filename
+        self._formato_registro = formato_de(filename, formato)
+        self._registro = open(filename + '.log', 'a')
+        if self._registro.tell():
+            self.compactar()
+
+    def cerrar_registro(self):
+        if self._registro is not None:
+            self._registro.close()
+        self._registro = None
+        self._ruta_registro = None
+        self._formato_registro = None
+        self._entradas_registro = 0
+
+    def _registrar(self, *entradas):
+        if self._registro is None or not entradas:
+            return
+        self._registro.write(''.join(json.dumps(entrada) + '\n' for entrada in entradas))
+        self._entradas_registro += len(entradas)
+        if self._entradas_registro >= self.umbral_compactacion:
+            self.compactar()
+
+    def _reproducir_registro(self, filename, filtro=None):
+        entradas = 0
         with open(filename, 'r') as f:
-            data = json.load(f)
-            self.productos = []
-            for item in data:
-                if 'marca' in item:
-                    self.productos.append(ProductoElectronico(**item))
-                elif 'fecha_caducidad' in item:
-                    self.productos.append(ProductoAlimenticio(**item))
+            for linea in f:
+                try:
+                    entrada = json.loads(linea)
+                except json.JSONDecodeError:
+                    break
+                if entrada['op'] == 'agregar':
+                    if filtro is None or filtro(entrada['producto']):
+                        producto = _producto_desde_dict(entrada['producto'])
+                        self.eliminar_producto(producto.nombre)
+                        self.agregar_producto(producto)
+                elif entrada['op'] == 'actualizar':
+                    self.actualizar_producto(entrada['nombre'], **entrada['cambios'])
+                elif entrada['op'] == 'eliminar':
+                    self.eliminar_producto(entrada['nombre'])
+                entradas += 1
+        return entradas
+
+    def compactar(self):
+        if self._registro is None:
+            raise ValueError("No hay un registro de cambios abierto")
+        escribir_registros(self._ruta_registro, [p.to_dict() for p in self.productos], self._formato_registro)
+        self._registro.flush()
+        self._registro.truncate(0)
+        self._entradas_registro = 0
 
-def main():
-    inventario = Inventario()
+    def guardar_en_json(self, filename, formato=None):
+        if self._registro is not None and filename == self._ruta_registro:
+            self._registro.flush()
+            os.fsync(self._registro.fileno())
+        else:
+            escribir_registros(filename, [p.to_dict() for p in self.productos], formato)
+
+    def cargar_desde_json(self, filename, streaming=False, filtro=None, formato=None):
+        registro, self._registro = self._registro, None
+        entradas = 0
+        anterior = self._estado()
+        try:
+            self._vaciar()
+            if os.path.exists(filename) or not os.path.exists(filename + '.log'):
+                self._cargar_snapshot(filename, streaming, filtro, formato)
+            if os.path.exists(filename + '.log'):
+                entradas = self._reproducir_registro(filename + '.log', filtro)
+        except Exception:
+            self._restaurar(anterior)
+            raise
+        finally:
+            self._registro = registro
+        self._entradas_registro = entradas
+        if registro is not None and filename != self._ruta_registro:
+            self.compactar()
+
+    def _cargar_snapshot(self, filename, streaming, filtro, formato):
+        if streaming:
+            if formato_de(filename, formato) != 'json':
+                raise ValueError("La carga en streaming solo admite JSON")
+            for producto in self.iterar_desde_json(filename, filtro):
+                self.agregar_producto(producto)
+            return
+        for item in leer_registros(filename, formato):
+            if filtro is None or filtro(item):
+                producto = _producto_desde_dict(item)
+                if producto is not None:
+                    self.agregar_producto(producto)
+
+    def iterar_desde_json(self, filename, filtro=None):
+        for item in _iterar_arreglo_json(filename):
+            if filtro is None or filtro(item):
+                producto = _producto_desde_dict(item)
+                if producto is not None:
+                    yield producto
+
+def _producto_desde_dict(item):
+    if 'marca' in item:
+        return ProductoElectronico(**item)
+    elif 'fecha_caducidad' in item:
+        return ProductoAlimenticio(**item)
+    return None
+
+def _iterar_arreglo_json(filename, tamano_bloque=1 << 16):
+    decoder = json.JSONDecoder()
+    espacios = re.compile(r'[\s,]*')
+    with open(filename, 'r') as f:
+        buffer = f.read(tamano_bloque).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError("El archivo no contiene un arreglo JSON")
+        posicion = 1
+        fin = False
+        while True:
+            posicion = espacios.match(buffer, posicion).end()
+            if posicion < len(buffer) and buffer[posicion] == ']':
+                return
+            try:
+                item, siguiente = decoder.raw_decode(buffer, posicion)
+            except json.JSONDecodeError:
+                siguiente = None
+            if siguiente is None or (siguiente == len(buffer) and not fin):
+                if fin:
+                    raise ValueError("Arreglo JSON incompleto")
+                bloque = f.read(tamano_bloque)
+                fin = not bloque
+                buffer = buffer[posicion:] + bloque
+                posicion = 0
+                continue
+            posicion = siguiente
+            yield item
+
+INSTRUMENTACION = Instrumentacion(
+    (Producto, ProductoElectronico, ProductoAlimenticio, Inventario),
+    ('leer_registros', 'escribir_registros', '_producto_desde_dict'),
+    globals(),
+)
+
+MAXIMO_ERRORES_LOTE = 20
+
+def _producto_de_lote(item):
+    producto = _producto_desde_dict(item)
+    if producto is None:
+        raise ValueError("Tipo de producto no válido")
+    return producto
+
+OPERACIONES_LOTE = {
+    'agregar': lambda inventario, item: inventario.agregar_producto(_producto_de_lote(item)),
+    'eliminar': lambda inventario, item: inventario.eliminar_producto(item['nombre']),
+    'actualizar': lambda inventario, item: inventario.actualizar_producto(item.pop('nombre'), **item),
+}
+
+def procesar_lote(sistema, lineas):
+    resumen = {'operaciones': 0, 'exitosas': 0, 'fallidas': 0, 'errores': []}
+    inicio = time.perf_counter()
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        resumen['operaciones'] += 1
+        try:
+            item = json.loads(linea)
+            operacion = OPERACIONES_LOTE.get(item.pop('op', None))
+            if operacion is None:
+                raise ValueError("Operación no válida")
+            if operacion(sistema, item) is False:
+                raise ValueError("Producto no encontrado")
+            resumen['exitosas'] += 1
+        except Exception as e:
+            resumen['fallidas'] += 1
+            if len(resumen['errores']) < MAXIMO_ERRORES_LOTE:
+                resumen['errores'].append({'linea': numero, 'error': str(e)})
+    resumen['segundos'] = round(time.perf_counter() - inicio, 3)
+    return resumen
+
+def menu():
+    inventario = Inventario(indices=('marca', 'fecha_caducidad'))
 
     while True:
         print("\n1. Agregar producto")
@@ -139,5 +668,35 @@ def main():
         except Exception as e:
             print(f"Error inesperado: {e}")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de gestión de productos")
+    parser.add_argument('--lote', help="archivo JSON lines con una operación por línea ('-' para leer de stdin)")
+    parser.add_argument('--cargar', help="archivo a cargar antes de procesar el lote")
+    parser.add_argument('--guardar', help="archivo donde guardar al terminar el lote (si se omite, no se guarda nada)")
+    parser.add_argument('--perfil', action='store_true', help="mide llamadas y latencias y las muestra como JSON en stderr al terminar")
+    args = parser.parse_args(argv)
+    if args.perfil:
+        INSTRUMENTACION.activar()
+    if args.lote is None:
+        menu()
+    else:
+        _modo_lote(args)
+    if args.perfil:
+        print(json.dumps(INSTRUMENTACION.reporte()), file=sys.stderr)
+
+def _modo_lote(args):
+    inventario = Inventario(indices=('marca', 'fecha_caducidad'))
+    if args.cargar:
+        inventario.cargar_desde_json(args.cargar)
+    if args.lote == '-':
+        resumen = procesar_lote(inventario, sys.stdin)
+    else:
+        with open(args.lote) as f:
+            resumen = procesar_lote(inventario, f)
+    if args.guardar:
+        inventario.guardar_en_json(args.guardar)
+    resumen['registros'] = len(inventario.productos)
+    print(json.dumps(resumen))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("gestion_productos", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+
+def _inventario():
+    inventario = main.Inventario(indices=('marca', 'fecha_caducidad'))
+    inventario.agregar_producto(main.ProductoElectronico("tv", 500.0, 2, "Sony", 12))
+    inventario.agregar_producto(main.ProductoElectronico("radio", 50.0, 5, "Sony", 6))
+    inventario.agregar_producto(main.ProductoAlimenticio("pan", 2.0, 10, "2024-08-30"))
+    return inventario
+
+
+def _nombres(productos):
+    return sorted(producto.nombre for producto in productos)
+
+
+def test_actualizar_producto_reindexa():
+    inventario = _inventario()
+    assert inventario.actualizar_producto("tv", marca="LG", precio=450.0)
+    assert _nombres(inventario.buscar_por('marca', "Sony")) == ["radio"]
+    assert _nombres(inventario.buscar_por('marca', "LG")) == ["tv"]
+    assert inventario.valor_total() == 450.0 * 2 + 50.0 * 5 + 2.0 * 10
+
+
+def test_actualizar_producto_con_campo_invalido_no_toca_indices():
+    inventario = _inventario()
+    with pytest.raises(ValueError):
+        inventario.actualizar_producto("tv", marca="LG", color="rojo")
+    with pytest.raises(ValueError):
+        inventario.actualizar_producto("pan", marca="LG")
+    assert inventario.buscar_producto("tv").marca == "Sony"
+    assert _nombres(inventario.buscar_por('marca', "Sony")) == ["radio", "tv"]
+    assert inventario.buscar_por('marca', "LG") == []
+
+
+def test_productos_es_de_solo_lectura():
+    inventario = _inventario()
+    with pytest.raises(AttributeError):
+        inventario.productos.append(main.ProductoAlimenticio("leche", 1.0, 1, "2024-09-01"))
+    assert len(inventario.productos) == 3
+
+
+def test_carga_con_nombres_duplicados_conserva_el_inventario_anterior(tmp_path):
+    ruta = tmp_path / "inventario.json"
+    ruta.write_text(json.dumps([
+        {"nombre": "a", "precio": 1.0, "cantidad": 1, "fecha_caducidad": "2024-08-30"},
+        {"nombre": "a", "precio": 2.0, "cantidad": 1, "fecha_caducidad": "2024-08-31"},
+    ]))
+    inventario = _inventario()
+    with pytest.raises(ValueError):
+        inventario.cargar_desde_json(str(ruta))
+    assert _nombres(inventario.productos) == ["pan", "radio", "tv"]
+    assert _nombres(inventario.buscar_por('marca', "Sony")) == ["radio", "tv"]
+
+
+def test_registro_se_reproduce_al_reabrir(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    inventario = main.Inventario(indices=('marca',))
+    inventario.abrir_registro(ruta)
+    inventario.agregar_producto(main.ProductoElectronico("tv", 500.0, 2, "Sony", 12))
+    inventario.agregar_producto(main.ProductoAlimenticio("pan", 2.0, 10, "2024-08-30"))
+    inventario.actualizar_producto("tv", marca="LG")
+    inventario.eliminar_producto("pan")
+    inventario.cerrar_registro()
+    with open(ruta + ".log", "a") as f:
+        f.write('{"op": "eliminar", "nom')
+
+    copia = main.Inventario(indices=('marca',))
+    copia.abrir_registro(ruta)
+    assert [p.to_dict() for p in copia.productos] == [
+        {"nombre": "tv", "precio": 500.0, "cantidad": 2, "marca": "LG", "garantia": 12},
+    ]
+    assert _nombres(copia.buscar_por('marca', "LG")) == ["tv"]
+    copia.cerrar_registro()
+
+
+def test_actualizar_productos_rechaza_renombres_y_campos_invalidos():
+    inventario = _inventario()
+    resultados = inventario.actualizar_productos([
+        ("tv", {"nombre": "televisor"}),
+        ("radio", {"marca": "LG", "color": "rojo"}),
+        ("pan", {"precio": 3.0}),
+        ("nada", {"precio": 1.0}),
+        ("radio", {"marca": "Philips"}),
+    ])
+    assert resultados == [False, False, True, False, True]
+    assert inventario.buscar_producto("televisor") is None
+    assert inventario.buscar_producto("tv").nombre == "tv"
+    assert inventario.buscar_producto("pan").precio == 3.0
+    assert _nombres(inventario.buscar_por('marca', "Sony")) == ["tv"]
+    assert _nombres(inventario.buscar_por('marca', "Philips")) == ["radio"]
+    assert inventario.buscar_por('marca', "LG") == []
+
+
+def test_operaciones_en_lote_se_registran(tmp_path):
+    ruta = str(tmp_path / "inventario.json")
+    inventario = main.Inventario()
+    inventario.abrir_registro(ruta)
+    assert inventario.agregar_productos([
+        main.ProductoAlimenticio("pan", 2.0, 10, "2024-08-30"),
+        main.ProductoAlimenticio("pan", 9.0, 1, "2024-08-30"),
+        main.ProductoAlimenticio("leche", 1.0, 4, "2024-09-01"),
+    ]) == [True, False, True]
+    assert inventario.actualizar_productos([("pan", {"cantidad": 7}), ("pan", {"nombre": "x"})]) == [True, False]
+    assert inventario.eliminar_productos(["leche", "leche"]) == [True, False]
+    inventario.cerrar_registro()
+
+    copia = main.Inventario()
+    copia.abrir_registro(ruta)
+    assert [p.to_dict() for p in copia.productos] == [
+        {"nombre": "pan", "precio": 2.0, "cantidad": 7, "fecha_caducidad": "2024-08-30"},
+    ]
+    copia.cerrar_registro()
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from main import FORMATOS, CatalogoProductos, Producto, SistemaVentas, VentaLocal, VentaOnline, resumir_ventas
+
+def _medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+def _crear_ventas(n):
+    catalogo = CatalogoProductos()
+    ventas = []
+    for i in range(n):
+        fecha = f"2024-{1 + i % 12:02d}-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}"
+        productos = [Producto(f"producto{(i + j) % 500}", float(100 + (i + j) % 500)) for j in range(1 + i % 4)]
+        if i % 2:
+            ventas.append(VentaOnline(fecha, f"cliente{i % 1000}", productos, f"calle {i}", catalogo=catalogo))
+        else:
+            ventas.append(VentaLocal(fecha, f"cliente{i % 1000}", productos, f"sucursal{i % 20}", catalogo=catalogo))
+    return ventas
+
+def benchmark_formatos(n=100_000):
+    sistema = SistemaVentas()
+    for venta in _crear_ventas(n):
+        sistema.agregar_venta(venta)
+    esperado = [v.to_dict() for v in sistema.ventas]
+    print(f"Guardar y cargar {n} ventas")
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato in FORMATOS:
+            filename = os.path.join(directorio, f"ventas.{formato}")
+            guardar = _medir(sistema.guardar_en_json, filename)
+            copia = SistemaVentas()
+            cargar = _medir(lambda: copia.cargar_desde_json(filename, formato=formato))
+            if [v.to_dict() for v in copia.ventas] != esperado:
+                raise AssertionError(f"El formato {formato} no conserva los datos")
+            tamano = os.path.getsize(filename)
+            print(f"  {formato:8} {tamano / 2**20:7.1f} MiB, guardar {n / guardar:10.0f} reg/s, cargar {n / cargar:10.0f} reg/s")
+
+def benchmark_agregacion(n=400_000, fragmentos=8):
+    ventas = _crear_ventas(n)
+    print(f"Resumen de {n} ventas en {fragmentos} archivos")
+    with tempfile.TemporaryDirectory() as directorio:
+        archivos = _escribir_fragmentos(directorio, ventas, fragmentos)
+        for procesos in (1, 2, 4):
+            resumen = resumir_ventas(archivos, procesos=procesos)
+            print(f"  {procesos} proceso(s): {resumen.registros_por_segundo():10.0f} reg/s, total ${resumen.total:.2f}")
+
+def _escribir_fragmentos(directorio, ventas, fragmentos):
+    archivos = []
+    for i in range(fragmentos):
+        sistema = SistemaVentas()
+        sistema.ventas = ventas[i::fragmentos]
+        archivos.append(os.path.join(directorio, f"ventas{i}.json"))
+        sistema.guardar_en_json(archivos[-1])
+    return archivos
+
+def benchmark_ingesta(n=200_000, fragmentos=16):
+    ventas = _crear_ventas(n)
+    print(f"Ingesta de {n} ventas desde {fragmentos} archivos")
+    with tempfile.TemporaryDirectory() as directorio:
+        archivos = _escribir_fragmentos(directorio, ventas, fragmentos)
+        base = None
+        for hilos in (False, True):
+            for trabajadores in (1, 2, 4, 8):
+                sistema = SistemaVentas()
+                segundos = _medir(sistema.cargar_desde_archivos, archivos, None, trabajadores, hilos)
+                base = base or segundos
+                tipo = "hilos" if hilos else "procesos"
+                print(f"  {trabajadores} {tipo:8}: {segundos:.3f} s, {n / segundos:10.0f} reg/s ({base / segundos:.2f}x)")
+
+def _lineas(i):
+    return [(f"producto{(i + j) % 500}", float(100 + (i + j) % 500)) for j in range(1 + i % 4)]
+
+def _medir_memoria(construir):
+    tracemalloc.start()
+    objeto = construir()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objeto, memoria
+
+def _items_con_catalogo(n):
+    catalogo = CatalogoProductos()
+    items = []
+    for i in range(n):
+        venta = VentaLocal("2024-08-14 09:35:00", "cliente", [], "sucursal", catalogo=catalogo)
+        venta._fijar_items((catalogo.registrar(nombre, precio), 1) for nombre, precio in _lineas(i))
+        items.append(venta._items)
+    return items
+
+def benchmark_catalogo(n=1_000_000):
+    print(f"Catálogo compartido con {n} ventas")
+    sueltos, memoria_sueltos = _medir_memoria(lambda: [[Producto(nombre, precio) for nombre, precio in _lineas(i)] for i in range(n)])
+    del sueltos
+    compactos, memoria_compactos = _medir_memoria(lambda: _items_con_catalogo(n))
+    del compactos
+    print(f"  líneas como objetos Producto: {memoria_sueltos / 2**20:8.1f} MiB")
+    print(f"  líneas como array + catálogo: {memoria_compactos / 2**20:8.1f} MiB")
+    catalogo = CatalogoProductos()
+    sistema = SistemaVentas()
+    sistema.ventas = [
+        VentaLocal("2024-08-14 09:35:00", f"cliente{i % 1000}", [Producto(nombre, precio) for nombre, precio in _lineas(i)], "sucursal", catalogo=catalogo)
+        for i in range(n)
+    ]
+    with tempfile.TemporaryDirectory() as directorio:
+        anterior = os.path.join(directorio, "anterior.json")
+        with open(anterior, "w") as f:
+            json.dump([venta.to_dict() for venta in sistema.ventas], f)
+        compacto = os.path.join(directorio, "compacto.json")
+        sistema.guardar_en_json(compacto)
+        print(f"  archivo sin catálogo: {os.path.getsize(anterior) / 2**20:8.1f} MiB")
+        print(f"  archivo con catálogo: {os.path.getsize(compacto) / 2**20:8.1f} MiB")
+
+BENCHMARKS = {
+    'formatos': benchmark_formatos,
+    'agregacion': benchmark_agregacion,
+    'ingesta': benchmark_ingesta,
+    'catalogo': benchmark_catalogo,
+}
+
+if __name__ == "__main__":
+    for nombre in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[nombre]()
@@ -1,23 +1,318 @@
+import argparse
+import inspect
 import json
+import marshal
+import math
+import mmap
+import os
+import heapq
+import pickle
+import re
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import namedtuple
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-
-class Producto:
-    def __init__(self, nombre, precio):
-        self.nombre = nombre
-        self.precio = precio
+from functools import wraps
+
+FORMATOS = {
+    'json': (lambda registros: json.dumps(registros).encode(), json.loads),
+    'pickle': (lambda registros: pickle.dumps(registros, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    'marshal': (marshal.dumps, marshal.loads),
+}
+
+EXTENSIONES = {'.json': 'json', '.pickle': 'pickle', '.pkl': 'pickle', '.marshal': 'marshal'}
+
+def formato_de(filename, formato=None):
+    if formato is None:
+        formato = EXTENSIONES.get(os.path.splitext(filename)[1], 'json')
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    return formato
+
+def escribir_registros(filename, registros, formato=None):
+    volcar, _ = FORMATOS[formato_de(filename, formato)]
+    temporal = filename + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(volcar(registros))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, filename)
+
+def leer_registros(filename, formato=None):
+    if formato is None and formato_de(filename) == 'pickle':
+        raise ValueError("Un archivo pickle puede ejecutar código al cargarse; indique formato='pickle' explícitamente")
+    formato = formato_de(filename, formato)
+    _, cargar = FORMATOS[formato]
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        if formato == 'json':
+            return cargar(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return cargar(datos)
+
+CUBETAS_POR_OCTAVA = 4
+
+class Instrumentacion:
+    def __init__(self, clases, funciones=(), espacio=None):
+        self.clases = clases
+        self.funciones = funciones
+        self.espacio = espacio
+        self._originales = []
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    @property
+    def activa(self):
+        return bool(self._originales)
+
+    def reiniciar(self):
+        self.metodos = {}
+        self.objetos = {}
+
+    def activar(self):
+        if self._originales:
+            return
+        for clase in self.clases:
+            for nombre, funcion in list(vars(clase).items()):
+                if nombre == '__init__':
+                    envoltura = self._contar_objetos(clase, funcion)
+                elif nombre.startswith('_') or not _es_medible(funcion):
+                    continue
+                else:
+                    envoltura = self._medir(f"{clase.__name__}.{nombre}", funcion)
+                self._originales.append((clase, nombre, funcion))
+                setattr(clase, nombre, envoltura)
+        for nombre in self.funciones:
+            funcion = self.espacio[nombre]
+            self._originales.append((self.espacio, nombre, funcion))
+            self.espacio[nombre] = self._medir(nombre, funcion)
+
+    def desactivar(self):
+        while self._originales:
+            destino, nombre, funcion = self._originales.pop()
+            if isinstance(destino, dict):
+                destino[nombre] = funcion
+            else:
+                setattr(destino, nombre, funcion)
+
+    def _medir(self, nombre, funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self._anotar(nombre, time.perf_counter_ns() - inicio)
+        return envoltura
+
+    def _contar_objetos(self, clase, funcion):
+        @wraps(funcion)
+        def envoltura(objeto, *args, **kwargs):
+            funcion(objeto, *args, **kwargs)
+            if type(objeto) is clase:
+                with self._candado:
+                    self.objetos[clase.__name__] = self.objetos.get(clase.__name__, 0) + 1
+        return envoltura
+
+    def _anotar(self, nombre, nanosegundos):
+        cubeta = int(math.log2(nanosegundos) * CUBETAS_POR_OCTAVA) if nanosegundos > 0 else 0
+        with self._candado:
+            estadistica = self.metodos.get(nombre)
+            if estadistica is None:
+                estadistica = self.metodos[nombre] = {'llamadas': 0, 'total_ns': 0, 'max_ns': 0, 'cubetas': {}}
+            estadistica['llamadas'] += 1
+            estadistica['total_ns'] += nanosegundos
+            estadistica['max_ns'] = max(estadistica['max_ns'], nanosegundos)
+            estadistica['cubetas'][cubeta] = estadistica['cubetas'].get(cubeta, 0) + 1
+
+    def percentil(self, nombre, p):
+        estadistica = self.metodos[nombre]
+        objetivo = estadistica['llamadas'] * p / 100
+        acumuladas = 0
+        for cubeta, llamadas in sorted(estadistica['cubetas'].items()):
+            acumuladas += llamadas
+            if acumuladas >= objetivo:
+                return min(2 ** ((cubeta + 1) / CUBETAS_POR_OCTAVA), estadistica['max_ns']) / 1000
+        return estadistica['max_ns'] / 1000
+
+    def reporte(self, percentiles=(50, 90, 99)):
+        metodos = {}
+        for nombre, estadistica in sorted(self.metodos.items(), key=lambda e: -e[1]['total_ns']):
+            metodos[nombre] = {
+                'llamadas': estadistica['llamadas'],
+                'total_ms': round(estadistica['total_ns'] / 1e6, 3),
+                **{f"p{p}_us": round(self.percentil(nombre, p), 2) for p in percentiles},
+                'max_us': round(estadistica['max_ns'] / 1000, 2),
+            }
+        return {'metodos': metodos, 'objetos': dict(self.objetos)}
+
+def _es_medible(funcion):
+    return (
+        inspect.isfunction(funcion)
+        and not inspect.isgeneratorfunction(funcion)
+        and not getattr(funcion, '__isabstractmethod__', False)
+    )
+
+COSTO_ENVIO = 5
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+
+def parsear_fecha(fecha):
+    if isinstance(fecha, datetime):
+        return fecha
+    return datetime.fromisoformat(fecha)
+
+def _iterar_arreglo_json(filename, tamano_bloque=1 << 16):
+    decoder = json.JSONDecoder()
+    espacios = re.compile(r'[\s,]*')
+    with open(filename, 'r') as f:
+        buffer = f.read(tamano_bloque).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError("El archivo no contiene un arreglo JSON")
+        posicion = 1
+        fin = False
+        while True:
+            posicion = espacios.match(buffer, posicion).end()
+            if posicion < len(buffer) and buffer[posicion] == ']':
+                return
+            try:
+                item, siguiente = decoder.raw_decode(buffer, posicion)
+            except json.JSONDecodeError:
+                siguiente = None
+            if siguiente is None or (siguiente == len(buffer) and not fin):
+                if fin:
+                    raise ValueError("Arreglo JSON incompleto")
+                bloque = f.read(tamano_bloque)
+                fin = not bloque
+                buffer = buffer[posicion:] + bloque
+                posicion = 0
+                continue
+            posicion = siguiente
+            yield item
+
+def iterar_registros(filename, formato=None):
+    if formato_de(filename, formato) == 'json':
+        return _iterar_arreglo_json(filename)
+    return iter(leer_registros(filename, formato))
+
+class Producto(namedtuple('Producto', ('nombre', 'precio'))):
+    __slots__ = ()
 
     def to_dict(self):
         return {"nombre": self.nombre, "precio": self.precio}
 
+class CatalogoProductos:
+    __slots__ = ('productos', '_ids')
+
+    def __init__(self):
+        self.productos = []
+        self._ids = {}
+
+    def registrar(self, nombre, precio):
+        clave = (nombre, precio)
+        id_producto = self._ids.get(clave)
+        if id_producto is None:
+            id_producto = len(self.productos)
+            self._ids[clave] = id_producto
+            self.productos.append(Producto(nombre, precio))
+        return id_producto
+
+    def registrar_lista(self, catalogo):
+        return [self.registrar(nombre, precio) for nombre, precio in catalogo]
+
 class Venta(ABC):
-    def __init__(self, fecha, cliente, productos):
+    def __init__(self, fecha, cliente, productos, id=None, catalogo=None):
+        self.id = id
         self.fecha = fecha
         self.cliente = cliente
+        self._catalogo = CatalogoProductos() if catalogo is None else catalogo
         self.productos = productos
 
-    @abstractmethod
+    @property
+    def fecha(self):
+        return self._fecha
+
+    @fecha.setter
+    def fecha(self, fecha):
+        self._fecha = fecha
+        self._momento = None
+
+    @property
+    def momento(self):
+        if self._momento is None:
+            self._momento = parsear_fecha(self._fecha)
+        return self._momento
+
+    @property
+    def items(self):
+        productos = self._catalogo.productos
+        items = self._items
+        return [(productos[items[i]], items[i + 1]) for i in range(0, len(items), 2)]
+
+    @property
+    def productos(self):
+        return tuple(producto for producto, cantidad in self.items for _ in range(cantidad))
+
+    @productos.setter
+    def productos(self, productos):
+        items = []
+        for producto in productos:
+            id_producto = self._catalogo.registrar(producto.nombre, producto.precio)
+            if items and items[-1][0] == id_producto:
+                items[-1][1] += 1
+            else:
+                items.append([id_producto, 1])
+        self._fijar_items(items)
+
+    def _fijar_items(self, items):
+        self._items = array('I', (valor for item in items for valor in item))
+        self._total = None
+
+    def _usar_catalogo(self, catalogo):
+        if self._catalogo is catalogo:
+            return
+        productos = self._catalogo.productos
+        items = self._items
+        self._items = array('I', (
+            valor for i in range(0, len(items), 2)
+            for valor in (catalogo.registrar(*productos[items[i]]), items[i + 1])
+        ))
+        self._catalogo = catalogo
+
+    def _subtotal(self):
+        productos = self._catalogo.productos
+        items = self._items
+        return sum(productos[items[i]].precio * items[i + 1] for i in range(0, len(items), 2))
+
     def calcular_total(self):
+        if self._total is None:
+            self._total = self._calcular_total()
+        return self._total
+
+    def _campos(self):
+        return {
+            "id": self.id,
+            "fecha": self.fecha,
+            "cliente": self.cliente,
+            "tipo": self.__class__.__name__,
+        }
+
+    def to_dict(self):
+        return {**self._campos(), "productos": [p.to_dict() for p in self.productos]}
+
+    def _registro_compacto(self, ids_locales):
+        return {
+            **self._campos(),
+            "items": [[ids_locales.setdefault(producto, len(ids_locales)), cantidad] for producto, cantidad in self.items],
+        }
+
+    @abstractmethod
+    def _calcular_total(self):
         pass
 
     @abstractmethod
@@ -25,76 +320,404 @@ class Venta(ABC):
         pass
 
 class VentaOnline(Venta):
-    def __init__(self, fecha, cliente, productos, direccion_envio):
-        super().__init__(fecha, cliente, productos)
+    def __init__(self, fecha, cliente, productos, direccion_envio, id=None, catalogo=None):
+        super().__init__(fecha, cliente, productos, id, catalogo)
         self.direccion_envio = direccion_envio
 
-    def calcular_total(self):
-        return sum(producto.precio for producto in self.productos) + 5  # Costo de envío
+    def _campos(self):
+        return {**super()._campos(), "direccion_envio": self.direccion_envio}
+
+    def _calcular_total(self):
+        return self._subtotal() + COSTO_ENVIO
 
     def descripcion(self):
         return f"Venta Online - Fecha: {self.fecha}, Cliente: {self.cliente}, Total: ${self.calcular_total()}, Envío a: {self.direccion_envio}"
 
 class VentaLocal(Venta):
-    def __init__(self, fecha, cliente, productos, sucursal):
-        super().__init__(fecha, cliente, productos)
+    def __init__(self, fecha, cliente, productos, sucursal, id=None, catalogo=None):
+        super().__init__(fecha, cliente, productos, id, catalogo)
         self.sucursal = sucursal
 
-    def calcular_total(self):
-        return sum(producto.precio for producto in self.productos)
+    def _campos(self):
+        return {**super()._campos(), "sucursal": self.sucursal}
+
+    def _calcular_total(self):
+        return self._subtotal()
 
     def descripcion(self):
         return f"Venta Local - Fecha: {self.fecha}, Cliente: {self.cliente}, Total: ${self.calcular_total()}, Sucursal: {self.sucursal}"
 
 class SistemaVentas:
-    def __init__(self):
+    def __init__(self, umbral_compactacion=1024):
+        self.umbral_compactacion = umbral_compactacion
         self.ventas = []
 
-    def agregar_venta(self, venta):
-        self.ventas.append(venta)
+    @property
+    def ventas(self):
+        return tuple(venta for venta in self._ventas if venta is not None)
 
-    def eliminar_venta(self, indice):
-        if 0 <= indice < len(self.ventas):
-            del self.ventas[indice]
-        else:
-            raise ValueError("Índice de venta no válido")
+    @ventas.setter
+    def ventas(self, ventas):
+        self._asignar_ventas(ventas, CatalogoProductos())
+
+    def _asignar_ventas(self, ventas, catalogo):
+        anterior = dict(vars(self))
+        try:
+            self._catalogo = catalogo
+            self._ventas = []
+            self._posiciones = {}
+            self._eliminadas = 0
+            self._siguiente_id = 0
+            self._total_ventas = 0
+            self._momentos = []
+            self._ventas_por_fecha = []
+            self._huecos_fecha = 0
+            self._indices = {'cliente': {}, 'sucursal': {}, 'producto': {}}
+            for venta in ventas:
+                venta._usar_catalogo(catalogo)
+                self._registrar_id(venta)
+                self._indexar(venta, por_fecha=False)
+            self._ventas_por_fecha = sorted(self._ventas, key=lambda venta: venta.momento)
+            self._momentos = [venta.momento for venta in self._ventas_por_fecha]
+        except Exception:
+            vars(self).clear()
+            vars(self).update(anterior)
+            raise
+
+    def total_ventas(self):
+        return self._total_ventas
+
+    def _claves_indice(self, venta):
+        yield 'cliente', venta.cliente
+        if isinstance(venta, VentaLocal):
+            yield 'sucursal', venta.sucursal
+        for nombre in {producto.nombre for producto, _ in venta.items}:
+            yield 'producto', nombre
+
+    def _registrar_id(self, venta):
+        if venta.id is None:
+            venta.id = self._siguiente_id
+        elif venta.id in self._posiciones:
+            raise ValueError(f"Ya existe una venta con ID {venta.id}")
+        self._siguiente_id = max(self._siguiente_id, venta.id + 1)
+        self._posiciones[venta.id] = len(self._ventas)
+        self._ventas.append(venta)
+
+    def _posicion(self, id_venta):
+        posicion = self._posiciones.get(id_venta)
+        if posicion is None:
+            raise ValueError("ID de venta no válido")
+        return posicion
+
+    def compactar(self):
+        self._ventas = [venta for venta in self._ventas if venta is not None]
+        self._posiciones = {venta.id: posicion for posicion, venta in enumerate(self._ventas)}
+        self._eliminadas = 0
+        self._catalogo = CatalogoProductos()
+        for venta in self._ventas:
+            venta._usar_catalogo(self._catalogo)
+        self._compactar_fechas()
+
+    def _compactar_fechas(self):
+        vigentes = [(momento, venta) for momento, venta in zip(self._momentos, self._ventas_por_fecha) if venta is not None]
+        self._momentos = [momento for momento, _ in vigentes]
+        self._ventas_por_fecha = [venta for _, venta in vigentes]
+        self._huecos_fecha = 0
+
+    def _indexar(self, venta, por_fecha=True):
+        if por_fecha:
+            momento = venta.momento
+            posicion = bisect_right(self._momentos, momento)
+            self._momentos.insert(posicion, momento)
+            self._ventas_por_fecha.insert(posicion, venta)
+        for campo, valor in self._claves_indice(venta):
+            self._indices[campo].setdefault(valor, {})[venta.id] = venta
+        self._total_ventas += venta.calcular_total()
+
+    def _desindexar(self, venta):
+        posicion = bisect_left(self._momentos, venta.momento)
+        while self._ventas_por_fecha[posicion] is not venta:
+            posicion += 1
+        self._ventas_por_fecha[posicion] = None
+        self._huecos_fecha += 1
+        for campo, valor in self._claves_indice(venta):
+            grupo = self._indices[campo][valor]
+            del grupo[venta.id]
+            if not grupo:
+                del self._indices[campo][valor]
+        self._total_ventas -= venta.calcular_total()
+        if self._huecos_fecha >= self.umbral_compactacion and self._huecos_fecha * 2 >= len(self._momentos):
+            self._compactar_fechas()
 
-    def actualizar_venta(self, indice, **kwargs):
-        if 0 <= indice < len(self.ventas):
-            venta = self.ventas[indice]
+    def agregar_venta(self, venta):
+        venta.momento
+        venta._usar_catalogo(self._catalogo)
+        self._registrar_id(venta)
+        self._indexar(venta)
+
+    def eliminar_venta(self, id_venta):
+        posicion = self._posicion(id_venta)
+        self._desindexar(self._ventas[posicion])
+        self._ventas[posicion] = None
+        del self._posiciones[id_venta]
+        self._eliminadas += 1
+        if self._eliminadas >= self.umbral_compactacion and self._eliminadas * 2 >= len(self._ventas):
+            self.compactar()
+
+    def actualizar_venta(self, id_venta, **kwargs):
+        venta = self._ventas[self._posicion(id_venta)]
+        campos = (set(venta._campos()) | {'productos'}) - {'id', 'tipo'}
+        invalidos = sorted(set(kwargs) - campos)
+        if invalidos:
+            raise ValueError(f"Campo no válido para la venta {id_venta}: {', '.join(invalidos)}")
+        if 'fecha' in kwargs:
+            parsear_fecha(kwargs['fecha'])
+        anteriores = {key: getattr(venta, key) for key in kwargs}
+        self._desindexar(venta)
+        try:
             for key, value in kwargs.items():
                 setattr(venta, key, value)
+            venta.momento
+        except Exception:
+            for key, value in anteriores.items():
+                setattr(venta, key, value)
+            raise
+        finally:
+            self._indexar(venta)
+
+    def buscar_venta(self, id_venta):
+        posicion = self._posiciones.get(id_venta)
+        return None if posicion is None else self._ventas[posicion]
+
+    def buscar_ventas(self, desde=None, hasta=None, cliente=None, sucursal=None, producto=None, tipo=None):
+        minimo = None if desde is None else parsear_fecha(desde)
+        maximo = None if hasta is None else parsear_fecha(hasta)
+        inicio = 0 if minimo is None else bisect_left(self._momentos, minimo)
+        fin = len(self._momentos) if maximo is None else bisect_right(self._momentos, maximo)
+        criterios = {'cliente': cliente, 'sucursal': sucursal, 'producto': producto}
+        grupos = [self._indices[campo].get(valor, {}) for campo, valor in criterios.items() if valor is not None]
+        if grupos and min(map(len, grupos)) < fin - inicio:
+            candidatas = sorted(
+                (venta for venta in min(grupos, key=len).values()
+                 if (minimo is None or venta.momento >= minimo) and (maximo is None or venta.momento <= maximo)),
+                key=lambda venta: venta.momento,
+            )
         else:
-            raise ValueError("Índice de venta no válido")
+            candidatas = [venta for venta in self._ventas_por_fecha[inicio:fin] if venta is not None]
+        return [
+            venta for venta in candidatas
+            if all(venta.id in grupo for grupo in grupos)
+            and (tipo is None or isinstance(venta, tipo))
+        ]
+
+    def cargar_desde_archivos(self, archivos, formato=None, trabajadores=None, hilos=False):
+        ejecutor = ThreadPoolExecutor if hilos else ProcessPoolExecutor
+        with ejecutor(max_workers=trabajadores) as executor:
+            fragmentos = list(executor.map(_leer_fragmento, archivos, [formato] * len(archivos)))
+        catalogo = CatalogoProductos()
+        fragmentos = [
+            [(momento, item, ids) for momento, item in registros]
+            for ids, registros in ((catalogo.registrar_lista(productos), registros) for productos, registros in fragmentos)
+        ]
+        ventas = []
+        for momento, item, ids in heapq.merge(*fragmentos, key=lambda registro: registro[0]):
+            venta = _venta_desde_dict({**item, 'id': None}, ids, catalogo)
+            if venta is not None:
+                venta._momento = momento
+                ventas.append(venta)
+        self._asignar_ventas(ventas, catalogo)
+
+    def resumir(self):
+        inicio = time.perf_counter()
+        resumen = ResumenVentas()
+        for venta in self.ventas:
+            resumen.agregar_venta(venta)
+        resumen.segundos = time.perf_counter() - inicio
+        return resumen
+
+    def guardar_en_json(self, filename, formato=None):
+        ids_locales = {}
+        registros = [venta._registro_compacto(ids_locales) for venta in self.ventas]
+        cabecera = {
+            "catalogo": [list(producto) for producto in ids_locales],
+            "siguiente_id": self._siguiente_id,
+        }
+        registros.insert(0, cabecera)
+        escribir_registros(filename, registros, formato)
+
+    def cargar_desde_json(self, filename, formato=None):
+        ventas = []
+        catalogo = CatalogoProductos()
+        ids = None
+        siguiente_id = 0
+        for item in leer_registros(filename, formato):
+            if 'catalogo' in item:
+                ids = catalogo.registrar_lista(item['catalogo'])
+                siguiente_id = item.get('siguiente_id', 0)
+                continue
+            venta = _venta_desde_dict(item, ids, catalogo)
+            if venta is not None:
+                ventas.append(venta)
+        self._asignar_ventas(ventas, catalogo)
+        self._siguiente_id = max(self._siguiente_id, siguiente_id)
+
+def _leer_fragmento(filename, formato=None):
+    catalogo = []
+    registros = []
+    for item in leer_registros(filename, formato):
+        if 'catalogo' in item:
+            catalogo = item['catalogo']
+        else:
+            registros.append((parsear_fecha(item['fecha']), item))
+    registros.sort(key=lambda registro: registro[0])
+    return catalogo, registros
+
+def _venta_desde_dict(item, ids=None, catalogo=None):
+    compacta = 'items' in item
+    productos = [] if compacta else [Producto(**p) for p in item['productos']]
+    if item['tipo'] == 'VentaOnline':
+        venta = VentaOnline(item['fecha'], item['cliente'], productos, item['direccion_envio'], item.get('id'), catalogo)
+    elif item['tipo'] == 'VentaLocal':
+        venta = VentaLocal(item['fecha'], item['cliente'], productos, item['sucursal'], item.get('id'), catalogo)
+    else:
+        return None
+    if compacta:
+        venta._fijar_items((ids[i], cantidad) for i, cantidad in item['items'])
+    return venta
+
+class ResumenVentas:
+    def __init__(self):
+        self.registros = 0
+        self.total = 0
+        self.por_dia = {}
+        self.por_cliente = {}
+        self.por_sucursal = {}
+        self.por_canal = {}
+        self.segundos = 0.0
+
+    def _acumular(self, fecha, cliente, sucursal, canal, total):
+        self.registros += 1
+        self.total += total
+        dia = fecha[:10]
+        self.por_dia[dia] = self.por_dia.get(dia, 0) + total
+        self.por_cliente[cliente] = self.por_cliente.get(cliente, 0) + total
+        if sucursal is not None:
+            self.por_sucursal[sucursal] = self.por_sucursal.get(sucursal, 0) + total
+        self.por_canal[canal] = self.por_canal.get(canal, 0) + total
+
+    def agregar_registro(self, item, catalogo=None):
+        if 'items' in item:
+            total = sum(catalogo[i][1] * cantidad for i, cantidad in item['items'])
+        else:
+            total = sum(p['precio'] for p in item['productos'])
+        if item['tipo'] == 'VentaOnline':
+            total += COSTO_ENVIO
+        self._acumular(item['fecha'], item['cliente'], item.get('sucursal'), item['tipo'], total)
+
+    def agregar_venta(self, venta):
+        sucursal = venta.sucursal if isinstance(venta, VentaLocal) else None
+        self._acumular(str(venta.fecha), venta.cliente, sucursal, venta.__class__.__name__, venta.calcular_total())
+
+    def combinar(self, otro):
+        self.registros += otro.registros
+        self.total += otro.total
+        self.segundos += otro.segundos
+        for propio, ajeno in ((self.por_dia, otro.por_dia), (self.por_cliente, otro.por_cliente),
+                              (self.por_sucursal, otro.por_sucursal), (self.por_canal, otro.por_canal)):
+            for clave, valor in ajeno.items():
+                propio[clave] = propio.get(clave, 0) + valor
+        return self
+
+    def registros_por_segundo(self):
+        return self.registros / self.segundos if self.segundos else 0.0
 
-    def buscar_venta(self, indice):
-        if 0 <= indice < len(self.ventas):
-            return self.ventas[indice]
+    def to_dict(self):
+        return {
+            "registros": self.registros,
+            "total": self.total,
+            "por_dia": dict(sorted(self.por_dia.items())),
+            "por_cliente": self.por_cliente,
+            "por_sucursal": self.por_sucursal,
+            "por_canal": self.por_canal,
+            "segundos": self.segundos,
+            "registros_por_segundo": self.registros_por_segundo(),
+        }
+
+def _resumir_archivo(filename, formato=None):
+    inicio = time.perf_counter()
+    resumen = ResumenVentas()
+    catalogo = None
+    for item in iterar_registros(filename, formato):
+        if 'catalogo' in item:
+            catalogo = item['catalogo']
         else:
-            return None
-
-    def guardar_en_json(self, filename):
-        def venta_to_dict(venta):
-            venta_dict = venta.__dict__.copy()
-            venta_dict['productos'] = [p.to_dict() for p in venta.productos]
-            venta_dict['tipo'] = venta.__class__.__name__
-            return venta_dict
-
-        with open(filename, 'w') as f:
-            json.dump([venta_to_dict(v) for v in self.ventas], f, default=str)
-
-    def cargar_desde_json(self, filename):
-        with open(filename, 'r') as f:
-            data = json.load(f)
-            self.ventas = []
-            for item in data:
-                productos = [Producto(**p) for p in item['productos']]
-                if item['tipo'] == 'VentaOnline':
-                    self.ventas.append(VentaOnline(item['fecha'], item['cliente'], productos, item['direccion_envio']))
-                elif item['tipo'] == 'VentaLocal':
-                    self.ventas.append(VentaLocal(item['fecha'], item['cliente'], productos, item['sucursal']))
-
-def main():
+            resumen.agregar_registro(item, catalogo)
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+def resumir_ventas(archivos, formato=None, procesos=1):
+    if isinstance(archivos, str):
+        archivos = [archivos]
+    inicio = time.perf_counter()
+    resumen = ResumenVentas()
+    if procesos > 1 and len(archivos) > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            parciales = list(executor.map(_resumir_archivo, archivos, [formato] * len(archivos)))
+    else:
+        parciales = (_resumir_archivo(filename, formato) for filename in archivos)
+    for parcial in parciales:
+        resumen.combinar(parcial)
+    resumen.segundos = time.perf_counter() - inicio
+    return resumen
+
+INSTRUMENTACION = Instrumentacion(
+    (Producto, CatalogoProductos, Venta, VentaOnline, VentaLocal, SistemaVentas, ResumenVentas),
+    ('leer_registros', 'escribir_registros', '_venta_desde_dict', 'resumir_ventas'),
+    globals(),
+)
+
+MAXIMO_ERRORES_LOTE = 20
+
+def _venta_de_lote(item):
+    venta = _venta_desde_dict(item)
+    if venta is None:
+        raise ValueError("Tipo de venta no válido")
+    return venta
+
+def _actualizar_venta_de_lote(sistema, item):
+    if 'productos' in item:
+        item['productos'] = [Producto(**p) for p in item['productos']]
+    sistema.actualizar_venta(item.pop('id'), **item)
+
+OPERACIONES_LOTE = {
+    'agregar': lambda sistema, item: sistema.agregar_venta(_venta_de_lote(item)),
+    'eliminar': lambda sistema, item: sistema.eliminar_venta(item['id']),
+    'actualizar': _actualizar_venta_de_lote,
+}
+
+def procesar_lote(sistema, lineas):
+    resumen = {'operaciones': 0, 'exitosas': 0, 'fallidas': 0, 'errores': []}
+    inicio = time.perf_counter()
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        resumen['operaciones'] += 1
+        try:
+            item = json.loads(linea)
+            operacion = OPERACIONES_LOTE.get(item.pop('op', None))
+            if operacion is None:
+                raise ValueError("Operación no válida")
+            if operacion(sistema, item) is False:
+                raise ValueError("Venta no encontrada")
+            resumen['exitosas'] += 1
+        except Exception as e:
+            resumen['fallidas'] += 1
+            if len(resumen['errores']) < MAXIMO_ERRORES_LOTE:
+                resumen['errores'].append({'linea': numero, 'error': str(e)})
+    resumen['segundos'] = round(time.perf_counter() - inicio, 3)
+    return resumen
+
+def menu():
     sistema = SistemaVentas()
 
     while True:
@@ -112,7 +735,7 @@ def main():
         try:
             if opcion == '1':
                 tipo = input("Tipo de venta (1: Online, 2: Local): ")
-                fecha = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                fecha = datetime.now().strftime(FORMATO_FECHA)
                 cliente = input("Nombre del cliente: ")
                 
                 productos = []
@@ -136,27 +759,28 @@ def main():
                 print("Venta agregada con éxito")
 
             elif opcion == '2':
-                indice = int(input("Índice de la venta a eliminar: "))
-                sistema.eliminar_venta(indice)
+                id_venta = int(input("ID de la venta a eliminar: "))
+                sistema.eliminar_venta(id_venta)
                 print("Venta eliminada con éxito")
 
             elif opcion == '3':
-                indice = int(input("Índice de la venta a actualizar: "))
+                id_venta = int(input("ID de la venta a actualizar: "))
                 cliente = input("Nuevo nombre del cliente: ")
-                sistema.actualizar_venta(indice, cliente=cliente)
+                sistema.actualizar_venta(id_venta, cliente=cliente)
                 print("Venta actualizada con éxito")
 
             elif opcion == '4':
-                indice = int(input("Índice de la venta a buscar: "))
-                venta = sistema.buscar_venta(indice)
+                id_venta = int(input("ID de la venta a buscar: "))
+                venta = sistema.buscar_venta(id_venta)
                 if venta:
                     print(venta.descripcion())
                 else:
                     print("Venta no encontrada")
 
             elif opcion == '5':
-                for i, venta in enumerate(sistema.ventas):
-                    print(f"{i}: {venta.descripcion()}")
+                for venta in sistema.ventas:
+                    print(f"{venta.id}: {venta.descripcion()}")
+                print(f"Total de ventas: ${sistema.total_ventas()}")
 
             elif opcion == '6':
                 sistema.guardar_en_json("ventas.json")
@@ -177,5 +801,35 @@ def main():
         except Exception as e:
             print(f"Error inesperado: {e}")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de gestión de ventas")
+    parser.add_argument('--lote', help="archivo JSON lines con una operación por línea ('-' para leer de stdin)")
+    parser.add_argument('--cargar', help="archivo a cargar antes de procesar el lote")
+    parser.add_argument('--guardar', help="archivo donde guardar al terminar el lote (si se omite, no se guarda nada)")
+    parser.add_argument('--perfil', action='store_true', help="mide llamadas y latencias y las muestra como JSON en stderr al terminar")
+    args = parser.parse_args(argv)
+    if args.perfil:
+        INSTRUMENTACION.activar()
+    if args.lote is None:
+        menu()
+    else:
+        _modo_lote(args)
+    if args.perfil:
+        print(json.dumps(INSTRUMENTACION.reporte()), file=sys.stderr)
+
+def _modo_lote(args):
+    sistema = SistemaVentas()
+    if args.cargar:
+        sistema.cargar_desde_json(args.cargar)
+    if args.lote == '-':
+        resumen = procesar_lote(sistema, sys.stdin)
+    else:
+        with open(args.lote) as f:
+            resumen = procesar_lote(sistema, f)
+    if args.guardar:
+        sistema.guardar_en_json(args.guardar)
+    resumen['registros'] = len(sistema.ventas)
+    print(json.dumps(resumen))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,152 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("gestion_ventas", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+A = main.Producto("a", 1.0)
+B = main.Producto("b", 2.0)
+
+
+def _sistema():
+    sistema = main.SistemaVentas()
+    sistema.agregar_venta(main.VentaLocal("2024-08-14 09:35:00", "ana", [A, B], "centro"))
+    sistema.agregar_venta(main.VentaOnline("2024-08-15 10:00:00", "beto", [B], "calle 1"))
+    return sistema
+
+
+def _ids(ventas):
+    return [venta.id for venta in ventas]
+
+
+def test_agregar_venta_con_fecha_invalida_no_la_registra(tmp_path):
+    sistema = _sistema()
+    with pytest.raises(ValueError):
+        sistema.agregar_venta(main.VentaLocal("mala", "carla", [A], "centro"))
+    assert _ids(sistema.ventas) == [0, 1]
+    assert sistema.buscar_venta(2) is None
+    assert sistema.total_ventas() == 3.0 + 2.0 + main.COSTO_ENVIO
+    sistema.agregar_venta(main.VentaLocal("2024-08-16 08:00:00", "carla", [A], "centro"))
+    assert _ids(sistema.ventas) == [0, 1, 2]
+    ruta = str(tmp_path / "ventas.json")
+    sistema.guardar_en_json(ruta)
+    copia = main.SistemaVentas()
+    copia.cargar_desde_json(ruta)
+    assert _ids(copia.ventas) == [0, 1, 2]
+
+
+def test_lote_con_fecha_invalida_no_guarda_la_venta(tmp_path):
+    sistema = _sistema()
+    lineas = [
+        json.dumps({"op": "agregar", "tipo": "VentaLocal", "fecha": "30/08/2024", "cliente": "c",
+                    "productos": [{"nombre": "a", "precio": 1.0}], "sucursal": "s"}),
+    ]
+    resumen = main.procesar_lote(sistema, lineas)
+    assert resumen['fallidas'] == 1
+    assert _ids(sistema.ventas) == [0, 1]
+
+
+@pytest.mark.parametrize("cambios", [
+    {"fecha": "30/08/2024"},
+    {"cliente": "zoe", "fecha": "mala"},
+    {"id": 9},
+    {"direccion_envio": "calle 2"},
+    {"cliente": "zoe", "productos": [1]},
+])
+def test_actualizar_venta_invalida_deja_la_venta_intacta(cambios):
+    sistema = _sistema()
+    total = sistema.total_ventas()
+    with pytest.raises((ValueError, AttributeError)):
+        sistema.actualizar_venta(0, **cambios)
+    venta = sistema.buscar_venta(0)
+    assert (venta.id, venta.cliente, venta.fecha, list(venta.productos)) == (0, "ana", "2024-08-14 09:35:00", [A, B])
+    assert sistema.total_ventas() == total
+    assert _ids(sistema.buscar_ventas(cliente="ana")) == [0]
+    assert _ids(sistema.buscar_ventas(desde="2024-08-14", hasta="2024-08-14 23:59:59")) == [0]
+    sistema.eliminar_venta(0)
+    assert _ids(sistema.ventas) == [1]
+
+
+def test_actualizar_venta_reindexa():
+    sistema = _sistema()
+    sistema.actualizar_venta(0, fecha="2024-08-20 12:00:00", cliente="zoe", productos=[A])
+    assert _ids(sistema.buscar_ventas(cliente="ana")) == []
+    assert _ids(sistema.buscar_ventas(cliente="zoe", producto="a")) == [0]
+    assert _ids(sistema.buscar_ventas(producto="b")) == [1]
+    assert _ids(sistema.buscar_ventas(desde="2024-08-16")) == [0]
+    assert sistema.total_ventas() == 1.0 + 2.0 + main.COSTO_ENVIO
+
+
+def test_ventas_es_de_solo_lectura():
+    sistema = _sistema()
+    with pytest.raises(AttributeError):
+        sistema.ventas.append(main.VentaLocal("2024-08-16 08:00:00", "carla", [A], "centro"))
+    assert _ids(sistema.ventas) == [0, 1]
+
+
+def test_carga_con_id_duplicado_conserva_las_ventas_anteriores(tmp_path):
+    ruta = tmp_path / "ventas.json"
+    venta = {"fecha": "2024-08-14 09:35:00", "cliente": "c", "tipo": "VentaLocal", "sucursal": "s",
+             "productos": [{"nombre": "a", "precio": 1.0}]}
+    ruta.write_text(json.dumps([{**venta, "id": 5}, {**venta, "id": 5}]))
+    sistema = _sistema()
+    with pytest.raises(ValueError):
+        sistema.cargar_desde_json(str(ruta))
+    assert _ids(sistema.ventas) == [0, 1]
+    assert _ids(sistema.buscar_ventas(desde="2024-08-01")) == [0, 1]
+    sistema.eliminar_venta(0)
+    sistema.agregar_venta(main.VentaLocal("2024-08-13 08:00:00", "carla", [A], "centro"))
+    assert _ids(sistema.buscar_ventas(desde="2024-08-01")) == [2, 1]
+
+
+def test_eliminar_deja_huecos_en_el_indice_de_fechas_hasta_compactar():
+    sistema = main.SistemaVentas(umbral_compactacion=4)
+    for dia in range(1, 11):
+        sistema.agregar_venta(main.VentaLocal(f"2024-08-{dia:02d} 10:00:00", f"c{dia % 2}", [A], "centro"))
+    for id_venta in (1, 3, 5):
+        sistema.eliminar_venta(id_venta)
+    assert len(sistema._momentos) == 10
+    assert _ids(sistema.buscar_ventas(desde="2024-08-01", hasta="2024-08-06 23:00:00")) == [0, 2, 4]
+    assert _ids(sistema.buscar_ventas(cliente="c1")) == [0, 2, 4, 6, 8]
+    sistema.actualizar_venta(6, fecha="2024-07-01 10:00:00")
+    assert _ids(sistema.buscar_ventas(hasta="2024-08-03 23:00:00")) == [6, 0, 2]
+    sistema.eliminar_venta(7)
+    sistema.compactar()
+    assert len(sistema._momentos) == len(sistema.ventas) == 6
+    assert _ids(sistema.buscar_ventas()) == [6, 0, 2, 4, 8, 9]
+    assert sistema.total_ventas() == 6.0
+
+
+def test_lineas_conservan_el_orden_y_son_inmutables():
+    venta = main.VentaLocal("2024-08-14 09:35:00", "ana", [A, B, B, A], "centro")
+    assert venta.productos == (A, B, B, A)
+    assert venta.items == [(A, 1), (B, 2), (A, 1)]
+    with pytest.raises(AttributeError):
+        venta.productos.append(A)
+    with pytest.raises(AttributeError):
+        venta.productos[0].precio = 5.0
+    assert venta.calcular_total() == 6.0
+
+
+def test_catalogo_por_sistema_se_poda_al_compactar(tmp_path):
+    sistema = main.SistemaVentas(umbral_compactacion=1)
+    otro = main.SistemaVentas()
+    venta = main.VentaLocal("2024-08-14 09:35:00", "ana", [A, B, A], "centro")
+    sistema.agregar_venta(venta)
+    sistema.agregar_venta(main.VentaLocal("2024-08-15 09:35:00", "beto", [main.Producto("z", 9.0)], "centro"))
+    otro.agregar_venta(main.VentaLocal("2024-08-15 09:35:00", "carla", [main.Producto("w", 4.0)], "norte"))
+    assert sistema._catalogo is not otro._catalogo
+    assert sistema._catalogo.productos == [A, B, main.Producto("z", 9.0)]
+    sistema.eliminar_venta(1)
+    assert sistema._catalogo.productos == [A, B]
+    assert venta.productos == (A, B, A)
+    ruta = str(tmp_path / "ventas.json")
+    sistema.guardar_en_json(ruta)
+    copia = main.SistemaVentas()
+    copia.cargar_desde_json(ruta)
+    assert copia.ventas[0].productos == (A, B, A)
+    assert copia.total_ventas() == 4.0
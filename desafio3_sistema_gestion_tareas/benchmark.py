@@ -0,0 +1,142 @@
+import os
+import sys
+import tempfile
+import time
+
+from datetime import datetime
+
+from main import FORMATOS, SistemaTareas, TareaRecurrente, TareaSimple
+
+PRIORIDADES = ("alta", "media", "baja")
+
+def _medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+def _crear_tareas(n):
+    tareas = []
+    for i in range(n):
+        fecha = f"{2024 + i % 3}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        if i % 4:
+            tareas.append(TareaSimple(f"tarea {i}", fecha, PRIORIDADES[i % 3]))
+        else:
+            tareas.append(TareaRecurrente(f"tarea {i}", fecha, 1 + i % 30))
+    return tareas
+
+def benchmark_formatos(n=200_000):
+    sistema = SistemaTareas()
+    for tarea in _crear_tareas(n):
+        sistema.agregar_tarea(tarea)
+    esperado = [t.to_dict() for t in sistema.tareas]
+    print(f"Guardar y cargar {n} tareas")
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato in FORMATOS:
+            filename = os.path.join(directorio, f"tareas.{formato}")
+            guardar = _medir(sistema.guardar_en_json, filename)
+            copia = SistemaTareas()
+            cargar = _medir(lambda: copia.cargar_desde_json(filename, formato=formato))
+            if [t.to_dict() for t in copia.tareas] != esperado:
+                raise AssertionError(f"El formato {formato} no conserva los datos")
+            tamano = os.path.getsize(filename)
+            print(f"  {formato:8} {tamano / 2**20:7.1f} MiB, guardar {n / guardar:10.0f} reg/s, cargar {n / cargar:10.0f} reg/s")
+
+def benchmark_planificador(n=1_000_000, consultas=1_000):
+    sistema = SistemaTareas()
+    print(f"Próxima tarea entre {n} tareas")
+    segundos = _medir(setattr, sistema, 'tareas', _crear_tareas(n))
+    print(f"  construir el heap: {segundos:.3f} s")
+
+    def por_recorrido():
+        for _ in range(consultas // 100):
+            min((t for t in sistema.tareas if t.estado != "completada"),
+                key=lambda t: datetime.strptime(t.fecha_vencimiento, "%Y-%m-%d"))
+
+    def por_heap():
+        for i in range(consultas):
+            sistema.actualizar_estado(i, "completada" if i % 2 else "en progreso")
+            sistema.planificador.proxima()
+
+    recorrido = _medir(por_recorrido) / (consultas // 100)
+    heap = _medir(por_heap) / consultas
+    print(f"  recorrido completo: {recorrido * 1e3:10.3f} ms/consulta")
+    print(f"  heap perezoso:      {heap * 1e3:10.3f} ms/consulta (incluye re-programar una tarea)")
+
+def benchmark_recurrentes(n=20_000, hasta="2026-01-01"):
+    print(f"Poner al día {n} tareas recurrentes hasta {hasta}")
+
+    def crear():
+        sistema = SistemaTareas()
+        sistema.tareas = [TareaRecurrente(f"tarea {i}", f"2024-{1 + i % 12:02d}-01", 1 + i % 30) for i in range(n)]
+        return sistema
+
+    def paso_a_paso(sistema):
+        limite = datetime.strptime(hasta, "%Y-%m-%d").date()
+        for indice, tarea in enumerate(sistema.tareas):
+            while tarea.vencimiento < limite:
+                sistema.actualizar_estado(indice, "completada")
+
+    individual_sistema, cerrado_sistema = crear(), crear()
+    individual = _medir(paso_a_paso, individual_sistema)
+    cerrado = _medir(cerrado_sistema.avanzar_recurrentes, hasta)
+    if [t.fecha_vencimiento for t in individual_sistema.tareas] != [t.fecha_vencimiento for t in cerrado_sistema.tareas]:
+        raise AssertionError("Los vencimientos no coinciden")
+    print(f"  completar ocurrencia por ocurrencia: {individual:.3f} s")
+    print(f"  avanzar_recurrentes:                 {cerrado:.3f} s ({individual / cerrado:.1f}x)")
+
+def benchmark_agenda(n=200_000, consultas=200):
+    sistema = SistemaTareas()
+    sistema.tareas = _crear_tareas(n)
+    ventanas = [(f"2025-{1 + i % 12:02d}-01", f"2025-{1 + i % 12:02d}-07") for i in range(consultas)]
+    print(f"Agenda semanal entre {n} tareas")
+
+    def por_recorrido():
+        for desde, hasta in ventanas[:consultas // 20]:
+            dias = {}
+            for fecha, tarea in sistema.ocurrencias(desde, hasta):
+                if tarea.estado != "completada":
+                    dias.setdefault(fecha, []).append(tarea)
+
+    def por_agenda():
+        for i, (desde, hasta) in enumerate(ventanas):
+            sistema.actualizar_estado(i, "en progreso")
+            sistema.agenda(desde, hasta)
+
+    recorrido = _medir(por_recorrido) / (consultas // 20)
+    agenda = _medir(por_agenda) / consultas
+    print(f"  recorrido completo:  {recorrido * 1e3:10.3f} ms/consulta")
+    print(f"  agenda con caché:    {agenda * 1e3:10.3f} ms/consulta (incluye actualizar una tarea)")
+
+def benchmark_estados(n=1_000_000, consultas=1_000):
+    sistema = SistemaTareas()
+    sistema.tareas = _crear_tareas(n)
+    for i in range(0, n, 100):
+        sistema.actualizar_estado(i, "en progreso")
+    print(f"Contar y listar por estado entre {n} tareas")
+
+    def por_recorrido():
+        for _ in range(consultas // 100):
+            sum(1 for t in sistema.tareas if t.estado == "pendiente")
+            [t for t in sistema.tareas if t.estado == "en progreso"]
+
+    def por_particiones():
+        for _ in range(consultas):
+            sistema.contar("pendiente")
+            sistema.listar("en progreso")
+
+    recorrido = _medir(por_recorrido) / (consultas // 100)
+    particiones = _medir(por_particiones) / consultas
+    print(f"  recorrido completo: {recorrido * 1e3:10.3f} ms/consulta")
+    print(f"  particiones:        {particiones * 1e3:10.3f} ms/consulta ({recorrido / particiones:.0f}x)")
+
+BENCHMARKS = {
+    'formatos': benchmark_formatos,
+    'planificador': benchmark_planificador,
+    'recurrentes': benchmark_recurrentes,
+    'agenda': benchmark_agenda,
+    'estados': benchmark_estados,
+}
+
+if __name__ == "__main__":
+    for nombre in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[nombre]()
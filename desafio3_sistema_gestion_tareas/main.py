@@ -1,6 +1,169 @@
+import argparse
+import heapq
+import inspect
+import itertools
 import json
+import marshal
+import math
+import mmap
+import os
+import pickle
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from array import array
+from collections import OrderedDict
+from datetime import date, timedelta
+from functools import wraps
+
+FORMATOS = {
+    'json': (lambda registros: json.dumps(registros).encode(), json.loads),
+    'pickle': (lambda registros: pickle.dumps(registros, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    'marshal': (marshal.dumps, marshal.loads),
+}
+
+EXTENSIONES = {'.json': 'json', '.pickle': 'pickle', '.pkl': 'pickle', '.marshal': 'marshal'}
+
+def formato_de(filename, formato=None):
+    if formato is None:
+        formato = EXTENSIONES.get(os.path.splitext(filename)[1], 'json')
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    return formato
+
+def escribir_registros(filename, registros, formato=None):
+    volcar, _ = FORMATOS[formato_de(filename, formato)]
+    temporal = filename + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(volcar(registros))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, filename)
+
+def leer_registros(filename, formato=None):
+    if formato is None and formato_de(filename) == 'pickle':
+        raise ValueError("Un archivo pickle puede ejecutar código al cargarse; indique formato='pickle' explícitamente")
+    formato = formato_de(filename, formato)
+    _, cargar = FORMATOS[formato]
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        if formato == 'json':
+            return cargar(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return cargar(datos)
+
+CUBETAS_POR_OCTAVA = 4
+
+class Instrumentacion:
+    def __init__(self, clases, funciones=(), espacio=None):
+        self.clases = clases
+        self.funciones = funciones
+        self.espacio = espacio
+        self._originales = []
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    @property
+    def activa(self):
+        return bool(self._originales)
+
+    def reiniciar(self):
+        self.metodos = {}
+        self.objetos = {}
+
+    def activar(self):
+        if self._originales:
+            return
+        for clase in self.clases:
+            for nombre, funcion in list(vars(clase).items()):
+                if nombre == '__init__':
+                    envoltura = self._contar_objetos(clase, funcion)
+                elif nombre.startswith('_') or not _es_medible(funcion):
+                    continue
+                else:
+                    envoltura = self._medir(f"{clase.__name__}.{nombre}", funcion)
+                self._originales.append((clase, nombre, funcion))
+                setattr(clase, nombre, envoltura)
+        for nombre in self.funciones:
+            funcion = self.espacio[nombre]
+            self._originales.append((self.espacio, nombre, funcion))
+            self.espacio[nombre] = self._medir(nombre, funcion)
+
+    def desactivar(self):
+        while self._originales:
+            destino, nombre, funcion = self._originales.pop()
+            if isinstance(destino, dict):
+                destino[nombre] = funcion
+            else:
+                setattr(destino, nombre, funcion)
+
+    def _medir(self, nombre, funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self._anotar(nombre, time.perf_counter_ns() - inicio)
+        return envoltura
+
+    def _contar_objetos(self, clase, funcion):
+        @wraps(funcion)
+        def envoltura(objeto, *args, **kwargs):
+            funcion(objeto, *args, **kwargs)
+            if type(objeto) is clase:
+                with self._candado:
+                    self.objetos[clase.__name__] = self.objetos.get(clase.__name__, 0) + 1
+        return envoltura
+
+    def _anotar(self, nombre, nanosegundos):
+        cubeta = int(math.log2(nanosegundos) * CUBETAS_POR_OCTAVA) if nanosegundos > 0 else 0
+        with self._candado:
+            estadistica = self.metodos.get(nombre)
+            if estadistica is None:
+                estadistica = self.metodos[nombre] = {'llamadas': 0, 'total_ns': 0, 'max_ns': 0, 'cubetas': {}}
+            estadistica['llamadas'] += 1
+            estadistica['total_ns'] += nanosegundos
+            estadistica['max_ns'] = max(estadistica['max_ns'], nanosegundos)
+            estadistica['cubetas'][cubeta] = estadistica['cubetas'].get(cubeta, 0) + 1
+
+    def percentil(self, nombre, p):
+        estadistica = self.metodos[nombre]
+        objetivo = estadistica['llamadas'] * p / 100
+        acumuladas = 0
+        for cubeta, llamadas in sorted(estadistica['cubetas'].items()):
+            acumuladas += llamadas
+            if acumuladas >= objetivo:
+                return min(2 ** ((cubeta + 1) / CUBETAS_POR_OCTAVA), estadistica['max_ns']) / 1000
+        return estadistica['max_ns'] / 1000
+
+    def reporte(self, percentiles=(50, 90, 99)):
+        metodos = {}
+        for nombre, estadistica in sorted(self.metodos.items(), key=lambda e: -e[1]['total_ns']):
+            metodos[nombre] = {
+                'llamadas': estadistica['llamadas'],
+                'total_ms': round(estadistica['total_ns'] / 1e6, 3),
+                **{f"p{p}_us": round(self.percentil(nombre, p), 2) for p in percentiles},
+                'max_us': round(estadistica['max_ns'] / 1000, 2),
+            }
+        return {'metodos': metodos, 'objetos': dict(self.objetos)}
+
+def _es_medible(funcion):
+    return (
+        inspect.isfunction(funcion)
+        and not inspect.isgeneratorfunction(funcion)
+        and not getattr(funcion, '__isabstractmethod__', False)
+    )
+
+FORMATO_FECHA = "%Y-%m-%d"
+PRIORIDADES = {"alta": 0, "media": 1, "baja": 2}
+
+def parsear_fecha(fecha):
+    if isinstance(fecha, date):
+        return fecha
+    return date.fromisoformat(fecha)
 
 class Tarea(ABC):
     def __init__(self, descripcion, fecha_vencimiento, estado="pendiente"):
@@ -8,6 +171,38 @@ class Tarea(ABC):
         self.fecha_vencimiento = fecha_vencimiento
         self.estado = estado
 
+    @property
+    def fecha_vencimiento(self):
+        return self._fecha_vencimiento
+
+    @fecha_vencimiento.setter
+    def fecha_vencimiento(self, fecha_vencimiento):
+        self._fecha_vencimiento = fecha_vencimiento
+        self._vencimiento = None
+
+    @property
+    def vencimiento(self):
+        if self._vencimiento is None:
+            self._vencimiento = parsear_fecha(self._fecha_vencimiento)
+        return self._vencimiento
+
+    def _fijar_vencimiento(self, vencimiento):
+        self._fecha_vencimiento = vencimiento.strftime(FORMATO_FECHA)
+        self._vencimiento = vencimiento
+
+    def ocurrencias(self, desde=None, hasta=None):
+        vencimiento = self.vencimiento
+        if (desde is None or vencimiento >= parsear_fecha(desde)) and (hasta is None or vencimiento <= parsear_fecha(hasta)):
+            yield vencimiento
+
+    def to_dict(self):
+        return {
+            "descripcion": self.descripcion,
+            "fecha_vencimiento": self.fecha_vencimiento,
+            "estado": self.estado,
+            "tipo": self.__class__.__name__,
+        }
+
     @abstractmethod
     def actualizar_estado(self):
         pass
@@ -21,6 +216,9 @@ class TareaSimple(Tarea):
         super().__init__(descripcion, fecha_vencimiento, estado)
         self.prioridad = prioridad
 
+    def to_dict(self):
+        return {**super().to_dict(), "prioridad": self.prioridad}
+
     def actualizar_estado(self, nuevo_estado):
         self.estado = nuevo_estado
 
@@ -32,57 +230,367 @@ class TareaRecurrente(Tarea):
         super().__init__(descripcion, fecha_vencimiento, estado)
         self.frecuencia = frecuencia
 
+    def to_dict(self):
+        return {**super().to_dict(), "frecuencia": self.frecuencia}
+
     def actualizar_estado(self, nuevo_estado):
         self.estado = nuevo_estado
         if nuevo_estado == "completada":
-            self.fecha_vencimiento = (datetime.strptime(self.fecha_vencimiento, "%Y-%m-%d") + timedelta(days=self.frecuencia)).strftime("%Y-%m-%d")
+            self._fijar_vencimiento(self.vencimiento + timedelta(days=self.frecuencia))
             self.estado = "pendiente"
 
+    def ocurrencias(self, desde=None, hasta=None):
+        fecha = self.vencimiento
+        if self.frecuencia <= 0:
+            yield from super().ocurrencias(desde, hasta)
+            return
+        if desde is not None:
+            atraso = (parsear_fecha(desde) - fecha).days
+            if atraso > 0:
+                fecha += timedelta(days=-(-atraso // self.frecuencia) * self.frecuencia)
+        limite = None if hasta is None else parsear_fecha(hasta)
+        paso = timedelta(days=self.frecuencia)
+        while limite is None or fecha <= limite:
+            yield fecha
+            fecha += paso
+
     def descripcion_completa(self):
         return f"Tarea Recurrente: {self.descripcion}, Vencimiento: {self.fecha_vencimiento}, Estado: {self.estado}, Frecuencia: cada {self.frecuencia} días"
 
+class PlanificadorTareas:
+    def __init__(self, tareas=()):
+        self._contador = itertools.count()
+        self._vigentes = {}
+        self._heap = []
+        for tarea in tareas:
+            if tarea.estado != "completada":
+                self._vigentes[id(tarea)] = self._entrada(tarea)
+        self._heap = list(self._vigentes.values())
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._vigentes)
+
+    def _entrada(self, tarea):
+        prioridad = PRIORIDADES.get(getattr(tarea, 'prioridad', None), len(PRIORIDADES))
+        return (tarea.vencimiento, prioridad, next(self._contador), tarea)
+
+    def _es_vigente(self, entrada):
+        return self._vigentes.get(id(entrada[3])) is entrada
+
+    def programar(self, tarea):
+        if tarea.estado == "completada":
+            self.descartar(tarea)
+            return
+        entrada = self._entrada(tarea)
+        self._vigentes[id(tarea)] = entrada
+        heapq.heappush(self._heap, entrada)
+        if len(self._heap) > 2 * len(self._vigentes) + 64:
+            self._heap = list(self._vigentes.values())
+            heapq.heapify(self._heap)
+
+    def descartar(self, tarea):
+        self._vigentes.pop(id(tarea), None)
+
+    def _limpiar_cima(self):
+        while self._heap and not self._es_vigente(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def proxima(self):
+        self._limpiar_cima()
+        return self._heap[0][3] if self._heap else None
+
+    def extraer_proxima(self):
+        self._limpiar_cima()
+        if not self._heap:
+            return None
+        tarea = heapq.heappop(self._heap)[3]
+        del self._vigentes[id(tarea)]
+        return tarea
+
+    def en_orden(self, antes_de=None):
+        limite = None if antes_de is None else parsear_fecha(antes_de)
+        frontera = [(self._heap[0], 0)] if self._heap else []
+        while frontera:
+            entrada, posicion = heapq.heappop(frontera)
+            if limite is not None and entrada[0] >= limite:
+                continue
+            if self._es_vigente(entrada):
+                yield entrada[3]
+            for hijo in (2 * posicion + 1, 2 * posicion + 2):
+                if hijo < len(self._heap):
+                    heapq.heappush(frontera, (self._heap[hijo], hijo))
+
+    def vencidas(self, hoy=None, prioridad=None):
+        return [
+            tarea for tarea in self.en_orden(antes_de=hoy or date.today())
+            if prioridad is None or getattr(tarea, 'prioridad', None) == prioridad
+        ]
+
 class SistemaTareas:
-    def __init__(self):
+    def __init__(self, tamano_cache_agenda=128):
+        self.tamano_cache_agenda = tamano_cache_agenda
         self.tareas = []
 
+    @property
+    def tareas(self):
+        return tuple(self._tareas)
+
+    @tareas.setter
+    def tareas(self, tareas):
+        anterior = dict(vars(self))
+        try:
+            self._tareas = list(tareas)
+            self.planificador = PlanificadorTareas(self._tareas)
+            self._por_dia = {}
+            self._recurrentes = {}
+            self._agenda = OrderedDict()
+            self._particiones = {}
+            for tarea in self._tareas:
+                self._agregar_a_calendario(tarea)
+                self._particiones.setdefault(_particion(tarea), {})[id(tarea)] = tarea
+        except Exception:
+            vars(self).clear()
+            vars(self).update(anterior)
+            raise
+
+    def _agregar_a_calendario(self, tarea):
+        if _es_periodica(tarea):
+            self._recurrentes[id(tarea)] = tarea
+        else:
+            self._por_dia.setdefault(tarea.vencimiento, {})[id(tarea)] = tarea
+
+    def _invalidar_agenda(self, tarea):
+        if not self._agenda:
+            return
+        vencimiento = tarea.vencimiento
+        if _es_periodica(tarea):
+            afectadas = [clave for clave in self._agenda if clave[1] >= vencimiento]
+        else:
+            afectadas = [clave for clave in self._agenda if clave[0] <= vencimiento <= clave[1]]
+        for clave in afectadas:
+            del self._agenda[clave]
+
+    def _indexar(self, tarea):
+        self.planificador.programar(tarea)
+        self._agregar_a_calendario(tarea)
+        self._particiones.setdefault(_particion(tarea), {})[id(tarea)] = tarea
+        self._invalidar_agenda(tarea)
+
+    def _desindexar(self, tarea):
+        self.planificador.descartar(tarea)
+        self._particiones[_particion(tarea)].pop(id(tarea), None)
+        self._recurrentes.pop(id(tarea), None)
+        grupo = self._por_dia.get(tarea.vencimiento)
+        if grupo is not None:
+            grupo.pop(id(tarea), None)
+            if not grupo:
+                del self._por_dia[tarea.vencimiento]
+        self._invalidar_agenda(tarea)
+
     def agregar_tarea(self, tarea):
-        self.tareas.append(tarea)
+        self._indexar(tarea)
+        self._tareas.append(tarea)
 
     def eliminar_tarea(self, indice):
-        if 0 <= indice < len(self.tareas):
-            del self.tareas[indice]
+        if 0 <= indice < len(self._tareas):
+            self._desindexar(self._tareas[indice])
+            del self._tareas[indice]
         else:
             raise ValueError("Índice de tarea no válido")
 
+    def _modificar(self, tarea, cambiar):
+        anterior = dict(vars(tarea))
+        self._desindexar(tarea)
+        try:
+            cambiar()
+            hash((tarea.vencimiento, _particion(tarea), _es_periodica(tarea)))
+        except Exception:
+            vars(tarea).clear()
+            vars(tarea).update(anterior)
+            raise
+        finally:
+            self._indexar(tarea)
+
     def actualizar_tarea(self, indice, **kwargs):
-        if 0 <= indice < len(self.tareas):
-            tarea = self.tareas[indice]
-            for key, value in kwargs.items():
-                setattr(tarea, key, value)
+        if 0 <= indice < len(self._tareas):
+            tarea = self._tareas[indice]
+            invalidos = sorted(set(kwargs) - (set(tarea.to_dict()) - {'tipo'}))
+            if invalidos:
+                raise ValueError(f"Campo no válido para la tarea {indice}: {', '.join(invalidos)}")
+            if 'fecha_vencimiento' in kwargs:
+                parsear_fecha(kwargs['fecha_vencimiento'])
+            def cambiar():
+                for key, value in kwargs.items():
+                    setattr(tarea, key, value)
+            self._modificar(tarea, cambiar)
+        else:
+            raise ValueError("Índice de tarea no válido")
+
+    def actualizar_estado(self, indice, nuevo_estado):
+        if 0 <= indice < len(self._tareas):
+            tarea = self._tareas[indice]
+            self._modificar(tarea, lambda: tarea.actualizar_estado(nuevo_estado))
         else:
             raise ValueError("Índice de tarea no válido")
 
+    def avanzar_recurrentes(self, hasta):
+        limite = parsear_fecha(hasta).toordinal()
+        recurrentes = [t for t in self._tareas if _es_periodica(t)]
+        ordinales = array('l', (t.vencimiento.toordinal() for t in recurrentes))
+        frecuencias = array('l', (t.frecuencia for t in recurrentes))
+        avanzados = array('l', (
+            o if o >= limite else o - (o - limite) // f * f
+            for o, f in zip(ordinales, frecuencias)
+        ))
+        cambiadas = 0
+        for tarea, anterior, nuevo in zip(recurrentes, ordinales, avanzados):
+            if nuevo != anterior:
+                self._desindexar(tarea)
+                tarea._fijar_vencimiento(date.fromordinal(nuevo))
+                self._indexar(tarea)
+                cambiadas += 1
+        return cambiadas
+
+    def agenda(self, desde, hasta, incluir_completadas=False):
+        clave = (parsear_fecha(desde), parsear_fecha(hasta), incluir_completadas)
+        dias = self._agenda.get(clave)
+        if dias is not None:
+            self._agenda.move_to_end(clave)
+            return {dia: list(tareas) for dia, tareas in dias.items()}
+        inicio, fin = clave[0], clave[1]
+        dias = {}
+        if (fin - inicio).days < len(self._por_dia):
+            dia = inicio
+            while dia <= fin:
+                if dia in self._por_dia:
+                    dias[dia] = list(self._por_dia[dia].values())
+                dia += timedelta(days=1)
+        else:
+            for dia, grupo in self._por_dia.items():
+                if inicio <= dia <= fin:
+                    dias[dia] = list(grupo.values())
+        for tarea in self._recurrentes.values():
+            for fecha in tarea.ocurrencias(inicio, fin):
+                dias.setdefault(fecha, []).append(tarea)
+        if not incluir_completadas:
+            dias = {dia: [t for t in tareas if t.estado != "completada"] for dia, tareas in dias.items()}
+        dias = {dia: tareas for dia, tareas in sorted(dias.items()) if tareas}
+        self._agenda[clave] = dias
+        if len(self._agenda) > self.tamano_cache_agenda:
+            self._agenda.popitem(last=False)
+        return {dia: list(tareas) for dia, tareas in dias.items()}
+
+    def _particiones_de(self, estado, prioridad):
+        return [
+            tareas for (e, p), tareas in self._particiones.items()
+            if (estado is None or e == estado) and (prioridad is None or p == prioridad)
+        ]
+
+    def contar(self, estado=None, prioridad=None):
+        return sum(len(tareas) for tareas in self._particiones_de(estado, prioridad))
+
+    def listar(self, estado=None, prioridad=None):
+        return [tarea for tareas in self._particiones_de(estado, prioridad) for tarea in tareas.values()]
+
+    def contadores(self):
+        por_estado = {}
+        por_prioridad = {}
+        for (estado, prioridad), tareas in self._particiones.items():
+            por_estado[estado] = por_estado.get(estado, 0) + len(tareas)
+            if prioridad is not None:
+                por_prioridad[prioridad] = por_prioridad.get(prioridad, 0) + len(tareas)
+        return {"estado": por_estado, "prioridad": por_prioridad}
+
+    def ocurrencias(self, desde, hasta):
+        return heapq.merge(
+            *(_ocurrencias_de(tarea, desde, hasta) for tarea in self._tareas),
+            key=lambda ocurrencia: ocurrencia[0],
+        )
+
     def buscar_tarea(self, indice):
-        if 0 <= indice < len(self.tareas):
-            return self.tareas[indice]
+        if 0 <= indice < len(self._tareas):
+            return self._tareas[indice]
         else:
             return None
 
-    def guardar_en_json(self, filename):
-        with open(filename, 'w') as f:
-            json.dump([{**t.__dict__, 'tipo': t.__class__.__name__} for t in self.tareas], f)
-
-    def cargar_desde_json(self, filename):
-        with open(filename, 'r') as f:
-            data = json.load(f)
-            self.tareas = []
-            for item in data:
-                if item['tipo'] == 'TareaSimple':
-                    self.tareas.append(TareaSimple(item['descripcion'], item['fecha_vencimiento'], item['prioridad'], item['estado']))
-                elif item['tipo'] == 'TareaRecurrente':
-                    self.tareas.append(TareaRecurrente(item['descripcion'], item['fecha_vencimiento'], item['frecuencia'], item['estado']))
-
-def main():
+    def guardar_en_json(self, filename, formato=None):
+        escribir_registros(filename, [t.to_dict() for t in self.tareas], formato)
+
+    def cargar_desde_json(self, filename, formato=None):
+        data = leer_registros(filename, formato)
+        tareas = (_tarea_desde_dict(item) for item in data)
+        self.tareas = [tarea for tarea in tareas if tarea is not None]
+
+def _particion(tarea):
+    return tarea.estado, getattr(tarea, 'prioridad', None)
+
+def _es_periodica(tarea):
+    return isinstance(tarea, TareaRecurrente) and tarea.frecuencia > 0
+
+def _ocurrencias_de(tarea, desde, hasta):
+    for fecha in tarea.ocurrencias(desde, hasta):
+        yield fecha, tarea
+
+def _tarea_desde_dict(item):
+    if item['tipo'] == 'TareaSimple':
+        return TareaSimple(item['descripcion'], item['fecha_vencimiento'], item['prioridad'], item['estado'])
+    elif item['tipo'] == 'TareaRecurrente':
+        return TareaRecurrente(item['descripcion'], item['fecha_vencimiento'], item['frecuencia'], item['estado'])
+    return None
+
+INSTRUMENTACION = Instrumentacion(
+    (Tarea, TareaSimple, TareaRecurrente, PlanificadorTareas, SistemaTareas),
+    ('leer_registros', 'escribir_registros', '_tarea_desde_dict'),
+    globals(),
+)
+
+MAXIMO_ERRORES_LOTE = 20
+
+def _tarea_de_lote(item):
+    tarea = _tarea_desde_dict(item)
+    if tarea is None:
+        raise ValueError("Tipo de tarea no válido")
+    return tarea
+
+def _actualizar_tarea_de_lote(sistema, item):
+    indice = item.pop('indice')
+    estado = item.pop('estado', None)
+    if item:
+        sistema.actualizar_tarea(indice, **item)
+    if estado is not None:
+        sistema.actualizar_estado(indice, estado)
+
+OPERACIONES_LOTE = {
+    'agregar': lambda sistema, item: sistema.agregar_tarea(_tarea_de_lote(item)),
+    'eliminar': lambda sistema, item: sistema.eliminar_tarea(item['indice']),
+    'actualizar': _actualizar_tarea_de_lote,
+    'avanzar': lambda sistema, item: sistema.avanzar_recurrentes(item['hasta']),
+}
+
+def procesar_lote(sistema, lineas):
+    resumen = {'operaciones': 0, 'exitosas': 0, 'fallidas': 0, 'errores': []}
+    inicio = time.perf_counter()
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        resumen['operaciones'] += 1
+        try:
+            item = json.loads(linea)
+            operacion = OPERACIONES_LOTE.get(item.pop('op', None))
+            if operacion is None:
+                raise ValueError("Operación no válida")
+            if operacion(sistema, item) is False:
+                raise ValueError("Tarea no encontrada")
+            resumen['exitosas'] += 1
+        except Exception as e:
+            resumen['fallidas'] += 1
+            if len(resumen['errores']) < MAXIMO_ERRORES_LOTE:
+                resumen['errores'].append({'linea': numero, 'error': str(e)})
+    resumen['segundos'] = round(time.perf_counter() - inicio, 3)
+    return resumen
+
+def menu():
     sistema = SistemaTareas()
 
     while True:
@@ -123,7 +631,7 @@ def main():
             elif opcion == '3':
                 indice = int(input("Índice de la tarea a actualizar: "))
                 nuevo_estado = input("Nuevo estado (pendiente/en progreso/completada): ")
-                sistema.tareas[indice].actualizar_estado(nuevo_estado)
+                sistema.actualizar_estado(indice, nuevo_estado)
                 print("Tarea actualizada con éxito")
 
             elif opcion == '4':
@@ -157,5 +665,35 @@ def main():
         except Exception as e:
             print(f"Error inesperado: {e}")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de gestión de tareas")
+    parser.add_argument('--lote', help="archivo JSON lines con una operación por línea ('-' para leer de stdin)")
+    parser.add_argument('--cargar', help="archivo a cargar antes de procesar el lote")
+    parser.add_argument('--guardar', help="archivo donde guardar al terminar el lote (si se omite, no se guarda nada)")
+    parser.add_argument('--perfil', action='store_true', help="mide llamadas y latencias y las muestra como JSON en stderr al terminar")
+    args = parser.parse_args(argv)
+    if args.perfil:
+        INSTRUMENTACION.activar()
+    if args.lote is None:
+        menu()
+    else:
+        _modo_lote(args)
+    if args.perfil:
+        print(json.dumps(INSTRUMENTACION.reporte()), file=sys.stderr)
+
+def _modo_lote(args):
+    sistema = SistemaTareas()
+    if args.cargar:
+        sistema.cargar_desde_json(args.cargar)
+    if args.lote == '-':
+        resumen = procesar_lote(sistema, sys.stdin)
+    else:
+        with open(args.lote) as f:
+            resumen = procesar_lote(sistema, f)
+    if args.guardar:
+        sistema.guardar_en_json(args.guardar)
+    resumen['registros'] = len(sistema.tareas)
+    print(json.dumps(resumen))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import importlib.util
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("gestion_tareas", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+
+def _sistema():
+    sistema = main.SistemaTareas()
+    sistema.agregar_tarea(main.TareaSimple("informe", "2024-08-20", "alta"))
+    sistema.agregar_tarea(main.TareaSimple("compras", "2024-08-22", "baja"))
+    sistema.agregar_tarea(main.TareaRecurrente("riego", "2024-08-19", 7))
+    return sistema
+
+
+def _agenda(sistema, desde="2024-08-19", hasta="2024-08-31"):
+    return {str(dia): [tarea.descripcion for tarea in tareas] for dia, tareas in sistema.agenda(desde, hasta).items()}
+
+
+def test_carga_con_fecha_invalida_conserva_las_tareas_anteriores(tmp_path):
+    ruta = tmp_path / "tareas.json"
+    ruta.write_text(json.dumps([
+        {"descripcion": "a", "fecha_vencimiento": "2024-08-20", "estado": "pendiente", "tipo": "TareaSimple", "prioridad": "alta"},
+        {"descripcion": "b", "fecha_vencimiento": "20/08/2024", "estado": "pendiente", "tipo": "TareaSimple", "prioridad": "alta"},
+    ]))
+    sistema = _sistema()
+    with pytest.raises(ValueError):
+        sistema.cargar_desde_json(str(ruta))
+    assert [tarea.descripcion for tarea in sistema.tareas] == ["informe", "compras", "riego"]
+    assert sistema.contar() == 3
+    assert len(sistema.planificador) == 3
+    assert sistema.planificador.proxima().descripcion == "riego"
+
+
+@pytest.mark.parametrize("cambios", [
+    {"fecha_vencimiento": "30/08/2024"},
+    {"descripcion": "otro", "color": "rojo"},
+    {"prioridad": ["alta"]},
+])
+def test_actualizar_tarea_invalida_deja_los_indices_intactos(cambios):
+    sistema = _sistema()
+    antes = _agenda(sistema)
+    with pytest.raises((ValueError, TypeError)):
+        sistema.actualizar_tarea(0, **cambios)
+    assert sistema.tareas[0].to_dict() == main.TareaSimple("informe", "2024-08-20", "alta").to_dict()
+    assert _agenda(sistema) == antes
+    assert sistema.contar(prioridad="alta") == 1
+    assert [tarea.descripcion for tarea in sistema.planificador.en_orden()] == ["riego", "informe", "compras"]
+
+
+def test_agenda_se_invalida_al_modificar_tareas():
+    sistema = _sistema()
+    assert _agenda(sistema) == {
+        "2024-08-19": ["riego"], "2024-08-20": ["informe"], "2024-08-22": ["compras"], "2024-08-26": ["riego"],
+    }
+    sistema.actualizar_tarea(1, fecha_vencimiento="2024-08-27")
+    sistema.actualizar_estado(0, "completada")
+    sistema.agregar_tarea(main.TareaSimple("banco", "2024-08-21", "media"))
+    assert _agenda(sistema) == {
+        "2024-08-19": ["riego"], "2024-08-21": ["banco"], "2024-08-26": ["riego"], "2024-08-27": ["compras"],
+    }
+    sistema.actualizar_estado(2, "completada")
+    assert _agenda(sistema) == {"2024-08-21": ["banco"], "2024-08-26": ["riego"], "2024-08-27": ["compras"]}
+
+
+def test_agenda_devuelve_una_copia():
+    sistema = _sistema()
+    agenda = sistema.agenda("2024-08-19", "2024-08-31")
+    agenda[date(2024, 8, 20)].clear()
+    agenda.clear()
+    assert _agenda(sistema)["2024-08-20"] == ["informe"]
+
+
+def test_planificador_se_reordena_al_cambiar_claves():
+    sistema = _sistema()
+    assert sistema.planificador.proxima().descripcion == "riego"
+    sistema.actualizar_tarea(1, fecha_vencimiento="2024-08-01")
+    assert sistema.planificador.proxima().descripcion == "compras"
+    sistema.actualizar_tarea(1, fecha_vencimiento="2024-08-20", prioridad="alta")
+    sistema.actualizar_tarea(0, prioridad="baja")
+    sistema.actualizar_estado(2, "completada")
+    assert [tarea.descripcion for tarea in sistema.planificador.en_orden()] == ["compras", "informe", "riego"]
+    assert sistema.tareas[2].fecha_vencimiento == "2024-08-26"
+    sistema.eliminar_tarea(1)
+    assert [tarea.descripcion for tarea in sistema.planificador.en_orden()] == ["informe", "riego"]
+    assert (sistema.contar(prioridad="alta"), sistema.contar(prioridad="baja")) == (0, 1)
+
+
+def test_tareas_es_de_solo_lectura():
+    sistema = _sistema()
+    with pytest.raises(AttributeError):
+        sistema.tareas.append(main.TareaSimple("banco", "2024-08-21", "media"))
+    with pytest.raises(TypeError):
+        del sistema.tareas[0]
+    assert len(sistema.tareas) == sistema.contar() == len(sistema.planificador) == 3
@@ -0,0 +1,262 @@
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from decimal import Decimal
+from main import DURABILIDADES, FORMATOS, INSTRUMENTACION, CuentaAhorro, CuentaCorriente, SistemaBancario
+
+class _CuentaFlotante:
+    def __init__(self, saldo):
+        self.saldo = saldo
+
+    def depositar(self, monto):
+        self.saldo += monto
+
+    def retirar(self, monto):
+        if self.saldo >= monto:
+            self.saldo -= monto
+        else:
+            raise ValueError("Fondos insuficientes")
+
+class _SistemaBancarioLineal:
+    def __init__(self, cuentas):
+        self.cuentas = list(cuentas)
+
+    def buscar_cuenta(self, numero_cuenta):
+        return next((c for c in self.cuentas if c.numero_cuenta == numero_cuenta), None)
+
+def _medir(funcion, *args):
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+def _crear_cuentas(n):
+    cuentas = []
+    for i in range(n):
+        if i % 2:
+            cuentas.append(CuentaCorriente(str(i), f"titular{i}", float(i % 10000), 1000.0))
+        else:
+            cuentas.append(CuentaAhorro(str(i), f"titular{i}", float(i % 10000), 0.01 + (i % 5) / 100))
+    return cuentas
+
+def benchmark_formatos(n=200_000):
+    sistema = SistemaBancario()
+    for cuenta in _crear_cuentas(n):
+        sistema.crear_cuenta(cuenta)
+    esperado = [c.to_dict() for c in sistema.cuentas]
+    print(f"Guardar y cargar {n} cuentas")
+    with tempfile.TemporaryDirectory() as directorio:
+        for formato in FORMATOS:
+            filename = os.path.join(directorio, f"cuentas.{formato}")
+            guardar = _medir(sistema.guardar_en_json, filename)
+            copia = SistemaBancario()
+            cargar = _medir(lambda: copia.cargar_desde_json(filename, formato=formato))
+            if [c.to_dict() for c in copia.cuentas] != esperado:
+                raise AssertionError(f"El formato {formato} no conserva los datos")
+            tamano = os.path.getsize(filename)
+            print(f"  {formato:8} {tamano / 2**20:7.1f} MiB, guardar {n / guardar:10.0f} reg/s, cargar {n / cargar:10.0f} reg/s")
+
+def benchmark_transacciones(n=1_000_000, transacciones=200_000):
+    cuentas = _crear_cuentas(n)
+    lineal = _SistemaBancarioLineal(cuentas)
+    sistema = SistemaBancario()
+    sistema.cuentas = cuentas
+    numeros = [str((i * 7919) % n) for i in range(transacciones)]
+    print(f"Depósitos y retiros sobre {n} cuentas")
+
+    def operar(banco, numeros):
+        for i, numero in enumerate(numeros):
+            cuenta = banco.buscar_cuenta(numero)
+            if i % 2:
+                cuenta.retirar(1)
+            else:
+                cuenta.depositar(1)
+
+    muestra = numeros[:transacciones // 2000]
+    antes = _medir(operar, lineal, muestra)
+    despues = _medir(operar, sistema, numeros)
+    print(f"  lista con búsqueda lineal: {len(muestra) / antes:12.0f} transacciones/s")
+    print(f"  diccionario por número:    {len(numeros) / despues:12.0f} transacciones/s")
+    print(f"  eliminar {len(muestra)} cuentas: {_medir(lambda: [sistema.eliminar_cuenta(m) for m in muestra]) * 1e3:.3f} ms")
+
+def benchmark_concurrencia(n=10_000, operaciones=400_000):
+    aleatorio = random.Random(0)
+    lote = []
+    for _ in range(operaciones):
+        origen, destino = aleatorio.sample(range(n), 2)
+        lote.append(('transferir', str(origen), str(destino), aleatorio.randint(1, 500)))
+    print(f"{operaciones} transferencias concurrentes entre {n} cuentas")
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for trabajadores in (1, 2, 4, 8):
+            sistema = SistemaBancario()
+            sistema.cuentas = [CuentaAhorro(str(i), f"titular{i}", 1000.0) for i in range(n)]
+            inicial = sum(c.saldo_centavos for c in sistema.cuentas)
+            inicio = time.perf_counter()
+            resultados = sistema.ejecutar_lote(lote, trabajadores)
+            segundos = time.perf_counter() - inicio
+            final = sum(c.saldo_centavos for c in sistema.cuentas)
+            if final != inicial or any(c.saldo_centavos < 0 for c in sistema.cuentas):
+                raise AssertionError(f"El dinero no se conserva: {inicial} -> {final}")
+            rechazadas = resultados.count(False)
+            print(f"  {trabajadores} hilos: {operaciones / segundos:10.0f} transferencias/s, {rechazadas} rechazadas, total {final} centavos conservado")
+    finally:
+        sys.setswitchinterval(intervalo)
+
+def _percentil(valores, p):
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def benchmark_registro(n=1_000, operaciones=4_000):
+    print(f"Latencia de confirmación en el registro de transacciones ({operaciones} depósitos)")
+    with tempfile.TemporaryDirectory() as directorio:
+        for durabilidad in DURABILIDADES:
+            for hilos in (1, 8):
+                filename = os.path.join(directorio, f"cuentas_{durabilidad}_{hilos}.json")
+                sistema = SistemaBancario(durabilidad=durabilidad)
+                sistema.abrir_registro(filename)
+                sistema.cuentas = _crear_cuentas(n)
+                latencias = [[] for _ in range(hilos)]
+
+                def trabajar(h):
+                    for i in range(h, operaciones, hilos):
+                        inicio = time.perf_counter()
+                        sistema.depositar(str(i % n), 1)
+                        latencias[h].append(time.perf_counter() - inicio)
+
+                hilos_activos = [threading.Thread(target=trabajar, args=(h,)) for h in range(hilos)]
+                inicio = time.perf_counter()
+                for hilo in hilos_activos:
+                    hilo.start()
+                for hilo in hilos_activos:
+                    hilo.join()
+                segundos = time.perf_counter() - inicio
+                sistema.cerrar_registro()
+                todas = sorted(l for lista in latencias for l in lista)
+                print(f"  {durabilidad:9} {hilos} hilos: {operaciones / segundos:9.0f} tx/s, "
+                      f"p50 {_percentil(todas, 0.5) * 1e6:8.1f} µs, p99 {_percentil(todas, 0.99) * 1e6:8.1f} µs")
+
+def benchmark_intereses(n=1_000_000, periodos=12):
+    print(f"Intereses sobre {n} cuentas de ahorro")
+
+    def crear():
+        sistema = SistemaBancario()
+        sistema.cuentas = [CuentaAhorro(str(i), f"titular{i}", float(i % 10000), 0.001 + (i % 5) / 1000) for i in range(n)]
+        return sistema
+
+    def por_objeto(sistema, periodos):
+        for _ in range(periodos):
+            for cuenta in sistema.cuentas:
+                cuenta.aplicar_interes()
+
+    objetos, columnas = crear(), crear()
+    individual = _medir(por_objeto, objetos, 1)
+    primera = _medir(columnas.aplicar_intereses)
+    siguiente = _medir(columnas.aplicar_intereses)
+    print(f"  un periodo, cuenta por cuenta:   {individual:.3f} s")
+    print(f"  un periodo, columnas:            {primera:.3f} s (construyendo columnas), {siguiente:.3f} s después ({individual / siguiente:.1f}x)")
+
+    objetos, columnas = crear(), crear()
+    individual = _medir(por_objeto, objetos, periodos)
+    cerrada = _medir(columnas.aplicar_intereses, periodos)
+    desvio = max(abs(a.saldo_centavos - b.saldo_centavos) for a, b in zip(objetos.cuentas, columnas.cuentas))
+    print(f"  {periodos} periodos, cuenta por cuenta: {individual:.3f} s")
+    print(f"  {periodos} periodos, forma cerrada:     {cerrada:.3f} s ({individual / cerrada:.1f}x, redondeo distinto en hasta {desvio} centavos)")
+
+def benchmark_centavos(operaciones=1_000_000):
+    print(f"{operaciones} depósitos y retiros de $0.10 sobre una cuenta")
+    variantes = (
+        ("float", _CuentaFlotante(0.0), 0.1, lambda c: c.saldo),
+        ("Decimal", _CuentaFlotante(Decimal(0)), Decimal("0.10"), lambda c: c.saldo),
+        ("centavos", CuentaAhorro("1", "titular", 0), 10, lambda c: c.saldo_centavos / 100),
+    )
+    for nombre, cuenta, monto, saldo in variantes:
+        depositar = getattr(cuenta, "depositar_centavos", cuenta.depositar)
+        retirar = getattr(cuenta, "retirar_centavos", cuenta.retirar)
+
+        def operar():
+            for _ in range(operaciones // 4):
+                depositar(monto)
+                depositar(monto)
+                depositar(monto)
+                retirar(monto)
+
+        segundos = _medir(operar)
+        print(f"  {nombre:8} {operaciones / segundos:12.0f} op/s, saldo final {saldo(cuenta)!r} (esperado {operaciones // 2 * 0.1:.2f})")
+
+def benchmark_liquidacion(empleados=50_000, empleadores=100, transferencias=100_000):
+    aleatorio = random.Random(0)
+    lote = [
+        (f"empresa{aleatorio.randrange(empleadores)}", str(aleatorio.randrange(empleados)), aleatorio.randint(1_000, 500_000))
+        for _ in range(transferencias)
+    ]
+    print(f"Liquidar {transferencias} transferencias de {empleadores} empresas a {empleados} cuentas")
+
+    def crear():
+        sistema = SistemaBancario()
+        sistema.cuentas = [CuentaCorriente(f"empresa{i}", "empresa", 10**7, 0) for i in range(empleadores)]
+        for i in range(empleados):
+            sistema.crear_cuenta(CuentaAhorro(str(i), f"titular{i}", 0))
+        return sistema
+
+    def una_a_una(sistema):
+        for origen, destino, centavos in lote:
+            sistema.transferir_centavos(origen, destino, centavos)
+
+    individual_sistema, neto_sistema = crear(), crear()
+    individual = _medir(una_a_una, individual_sistema)
+    neto = _medir(neto_sistema.liquidar_transferencias_centavos, lote)
+    if [c.saldo_centavos for c in individual_sistema.cuentas] != [c.saldo_centavos for c in neto_sistema.cuentas]:
+        raise AssertionError("Los saldos no coinciden")
+    print(f"  transferir una a una: {transferencias / individual:10.0f} transferencias/s")
+    print(f"  liquidación neta:     {transferencias / neto:10.0f} transferencias/s ({individual / neto:.1f}x)")
+
+    fallido = lote + [("empresa0", "0", 10**12)]
+    antes = [c.saldo_centavos for c in neto_sistema.cuentas]
+    fallas = neto_sistema.liquidar_transferencias_centavos(fallido)
+    if [c.saldo_centavos for c in neto_sistema.cuentas] != antes:
+        raise AssertionError("Un lote rechazado modificó saldos")
+    print(f"  lote sin fondos: {len(fallas)} transferencias rechazadas, ningún saldo modificado")
+
+def benchmark_instrumentacion(n=10_000, operaciones=200_000):
+    lote = [(str(i % n), str((i + 1) % n)) for i in range(operaciones)]
+    print(f"Sobrecosto de la instrumentación en {operaciones} transferencias")
+
+    def transferir(sistema):
+        for origen, destino in lote:
+            sistema.transferir_centavos(origen, destino, 1)
+
+    def medir():
+        sistema = SistemaBancario()
+        sistema.cuentas = [CuentaAhorro(str(i), f"titular{i}", 1000) for i in range(n)]
+        return _medir(transferir, sistema)
+
+    medir()
+    base = medir()
+    INSTRUMENTACION.activar()
+    activa = medir()
+    INSTRUMENTACION.desactivar()
+    desactivada = medir()
+    print(f"  nunca activada:         {operaciones / base:10.0f} transferencias/s")
+    print(f"  activa:                 {operaciones / activa:10.0f} transferencias/s ({activa / base:.1f}x)")
+    print(f"  activada y desactivada: {operaciones / desactivada:10.0f} transferencias/s ({desactivada / base:.2f}x)")
+    metodo = "SistemaBancario.transferir_centavos"
+    print(f"  {metodo}: p50 {INSTRUMENTACION.percentil(metodo, 50):.2f} µs, p99 {INSTRUMENTACION.percentil(metodo, 99):.2f} µs")
+
+BENCHMARKS = {
+    'formatos': benchmark_formatos,
+    'transacciones': benchmark_transacciones,
+    'concurrencia': benchmark_concurrencia,
+    'registro': benchmark_registro,
+    'intereses': benchmark_intereses,
+    'centavos': benchmark_centavos,
+    'liquidacion': benchmark_liquidacion,
+    'instrumentacion': benchmark_instrumentacion,
+}
+
+if __name__ == "__main__":
+    for nombre in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[nombre]()
@@ -1,6 +1,188 @@
+import argparse
+import inspect
 import json
+import marshal
+import math
+import mmap
+import os
+import pickle
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Decimal
+from functools import wraps
+
+FORMATOS = {
+    'json': (lambda registros: json.dumps(registros).encode(), json.loads),
+    'pickle': (lambda registros: pickle.dumps(registros, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    'marshal': (marshal.dumps, marshal.loads),
+}
+
+EXTENSIONES = {'.json': 'json', '.pickle': 'pickle', '.pkl': 'pickle', '.marshal': 'marshal'}
+
+def formato_de(filename, formato=None):
+    if formato is None:
+        formato = EXTENSIONES.get(os.path.splitext(filename)[1], 'json')
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato no soportado: {formato}")
+    return formato
+
+def escribir_registros(filename, registros, formato=None):
+    volcar, _ = FORMATOS[formato_de(filename, formato)]
+    temporal = filename + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(volcar(registros))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, filename)
+
+def leer_registros(filename, formato=None):
+    if formato is None and formato_de(filename) == 'pickle':
+        raise ValueError("Un archivo pickle puede ejecutar código al cargarse; indique formato='pickle' explícitamente")
+    formato = formato_de(filename, formato)
+    _, cargar = FORMATOS[formato]
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        if formato == 'json':
+            return cargar(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            return cargar(datos)
+
+CUBETAS_POR_OCTAVA = 4
+
+class Instrumentacion:
+    def __init__(self, clases, funciones=(), espacio=None):
+        self.clases = clases
+        self.funciones = funciones
+        self.espacio = espacio
+        self._originales = []
+        self._candado = threading.Lock()
+        self.reiniciar()
+
+    @property
+    def activa(self):
+        return bool(self._originales)
+
+    def reiniciar(self):
+        self.metodos = {}
+        self.objetos = {}
+
+    def activar(self):
+        if self._originales:
+            return
+        for clase in self.clases:
+            for nombre, funcion in list(vars(clase).items()):
+                if nombre == '__init__':
+                    envoltura = self._contar_objetos(clase, funcion)
+                elif nombre.startswith('_') or not _es_medible(funcion):
+                    continue
+                else:
+                    envoltura = self._medir(f"{clase.__name__}.{nombre}", funcion)
+                self._originales.append((clase, nombre, funcion))
+                setattr(clase, nombre, envoltura)
+        for nombre in self.funciones:
+            funcion = self.espacio[nombre]
+            self._originales.append((self.espacio, nombre, funcion))
+            self.espacio[nombre] = self._medir(nombre, funcion)
+
+    def desactivar(self):
+        while self._originales:
+            destino, nombre, funcion = self._originales.pop()
+            if isinstance(destino, dict):
+                destino[nombre] = funcion
+            else:
+                setattr(destino, nombre, funcion)
+
+    def _medir(self, nombre, funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = time.perf_counter_ns()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self._anotar(nombre, time.perf_counter_ns() - inicio)
+        return envoltura
+
+    def _contar_objetos(self, clase, funcion):
+        @wraps(funcion)
+        def envoltura(objeto, *args, **kwargs):
+            funcion(objeto, *args, **kwargs)
+            if type(objeto) is clase:
+                with self._candado:
+                    self.objetos[clase.__name__] = self.objetos.get(clase.__name__, 0) + 1
+        return envoltura
+
+    def _anotar(self, nombre, nanosegundos):
+        cubeta = int(math.log2(nanosegundos) * CUBETAS_POR_OCTAVA) if nanosegundos > 0 else 0
+        with self._candado:
+            estadistica = self.metodos.get(nombre)
+            if estadistica is None:
+                estadistica = self.metodos[nombre] = {'llamadas': 0, 'total_ns': 0, 'max_ns': 0, 'cubetas': {}}
+            estadistica['llamadas'] += 1
+            estadistica['total_ns'] += nanosegundos
+            estadistica['max_ns'] = max(estadistica['max_ns'], nanosegundos)
+            estadistica['cubetas'][cubeta] = estadistica['cubetas'].get(cubeta, 0) + 1
+
+    def percentil(self, nombre, p):
+        estadistica = self.metodos[nombre]
+        objetivo = estadistica['llamadas'] * p / 100
+        acumuladas = 0
+        for cubeta, llamadas in sorted(estadistica['cubetas'].items()):
+            acumuladas += llamadas
+            if acumuladas >= objetivo:
+                return min(2 ** ((cubeta + 1) / CUBETAS_POR_OCTAVA), estadistica['max_ns']) / 1000
+        return estadistica['max_ns'] / 1000
+
+    def reporte(self, percentiles=(50, 90, 99)):
+        metodos = {}
+        for nombre, estadistica in sorted(self.metodos.items(), key=lambda e: -e[1]['total_ns']):
+            metodos[nombre] = {
+                'llamadas': estadistica['llamadas'],
+                'total_ms': round(estadistica['total_ns'] / 1e6, 3),
+                **{f"p{p}_us": round(self.percentil(nombre, p), 2) for p in percentiles},
+                'max_us': round(estadistica['max_ns'] / 1000, 2),
+            }
+        return {'metodos': metodos, 'objetos': dict(self.objetos)}
+
+def _es_medible(funcion):
+    return (
+        inspect.isfunction(funcion)
+        and not inspect.isgeneratorfunction(funcion)
+        and not getattr(funcion, '__isabstractmethod__', False)
+    )
+
+CENTAVOS = 100
+ESCALA_TASA = 10**9
+
+def a_centavos(monto):
+    if isinstance(monto, bool):
+        raise ValueError(f"Monto no válido: {monto}")
+    if isinstance(monto, int):
+        return monto * CENTAVOS
+    try:
+        return int((Decimal(str(monto)) * CENTAVOS).to_integral_value(rounding=ROUND_HALF_EVEN))
+    except ArithmeticError:
+        raise ValueError(f"Monto no válido: {monto}") from None
+
+def _validar_entero(centavos):
+    if isinstance(centavos, bool) or not isinstance(centavos, int):
+        raise ValueError(f"El monto debe ser un número entero de centavos: {centavos!r}")
+    return centavos
+
+def _validar_centavos(centavos):
+    if _validar_entero(centavos) <= 0:
+        raise ValueError("El monto debe ser positivo")
+
+def dividir_redondeando(numerador, denominador):
+    cociente, resto = divmod(numerador, denominador)
+    if 2 * resto > denominador or (2 * resto == denominador and cociente % 2):
+        cociente += 1
+    return cociente
 
 class CuentaBancaria(ABC):
     def __init__(self, numero_cuenta, titular, saldo=0):
@@ -9,12 +191,39 @@ class CuentaBancaria(ABC):
         self.saldo = saldo
         self.fecha_apertura = datetime.now().strftime("%Y-%m-%d")
 
-    @abstractmethod
+    @property
+    def saldo(self):
+        return self.saldo_centavos / CENTAVOS
+
+    @saldo.setter
+    def saldo(self, saldo):
+        self.saldo_centavos = a_centavos(saldo)
+
+    def to_dict(self):
+        return {
+            "numero_cuenta": self.numero_cuenta,
+            "titular": self.titular,
+            "saldo_centavos": self.saldo_centavos,
+            "fecha_apertura": self.fecha_apertura,
+            "tipo": self.__class__.__name__,
+        }
+
     def depositar(self, monto):
+        self.depositar_centavos(a_centavos(monto))
+
+    def retirar(self, monto):
+        self.retirar_centavos(a_centavos(monto))
+
+    @abstractmethod
+    def depositar_centavos(self, centavos):
         pass
 
     @abstractmethod
-    def retirar(self, monto):
+    def retirar_centavos(self, centavos):
+        pass
+
+    @abstractmethod
+    def saldo_minimo_centavos(self):
         pass
 
     @abstractmethod
@@ -26,76 +235,562 @@ class CuentaCorriente(CuentaBancaria):
         super().__init__(numero_cuenta, titular, saldo)
         self.limite_sobregiro = limite_sobregiro
 
-    def depositar(self, monto):
-        self.saldo += monto
+    @property
+    def limite_sobregiro(self):
+        return self.limite_sobregiro_centavos / CENTAVOS
 
-    def retirar(self, monto):
-        if self.saldo + self.limite_sobregiro >= monto:
-            self.saldo -= monto
+    @limite_sobregiro.setter
+    def limite_sobregiro(self, limite_sobregiro):
+        self.limite_sobregiro_centavos = a_centavos(limite_sobregiro)
+
+    def to_dict(self):
+        return {**super().to_dict(), "limite_sobregiro_centavos": self.limite_sobregiro_centavos}
+
+    def depositar_centavos(self, centavos):
+        self.saldo_centavos += centavos
+
+    def retirar_centavos(self, centavos):
+        if self.saldo_centavos + self.limite_sobregiro_centavos >= centavos:
+            self.saldo_centavos -= centavos
         else:
             raise ValueError("Fondos insuficientes")
 
+    def saldo_minimo_centavos(self):
+        return -self.limite_sobregiro_centavos
+
     def descripcion(self):
-        return f"Cuenta Corriente - Número: {self.numero_cuenta}, Titular: {self.titular}, Saldo: ${self.saldo}, Límite de sobregiro: ${self.limite_sobregiro}"
+        return f"Cuenta Corriente - Número: {self.numero_cuenta}, Titular: {self.titular}, Saldo: ${self.saldo:.2f}, Límite de sobregiro: ${self.limite_sobregiro:.2f}"
 
 class CuentaAhorro(CuentaBancaria):
     def __init__(self, numero_cuenta, titular, saldo=0, tasa_interes=0.01):
         super().__init__(numero_cuenta, titular, saldo)
         self.tasa_interes = tasa_interes
 
-    def depositar(self, monto):
-        self.saldo += monto
+    def to_dict(self):
+        return {**super().to_dict(), "tasa_interes": self.tasa_interes}
 
-    def retirar(self, monto):
-        if self.saldo >= monto:
-            self.saldo -= monto
+    def depositar_centavos(self, centavos):
+        self.saldo_centavos += centavos
+
+    def retirar_centavos(self, centavos):
+        if self.saldo_centavos >= centavos:
+            self.saldo_centavos -= centavos
         else:
             raise ValueError("Fondos insuficientes")
 
+    def saldo_minimo_centavos(self):
+        return 0
+
     def aplicar_interes(self):
-        interes = self.saldo * self.tasa_interes
-        self.saldo += interes
+        tasa = round(self.tasa_interes * ESCALA_TASA)
+        self.saldo_centavos += dividir_redondeando(self.saldo_centavos * tasa, ESCALA_TASA)
 
     def descripcion(self):
-        return f"Cuenta de Ahorro - Número: {self.numero_cuenta}, Titular: {self.titular}, Saldo: ${self.saldo}, Tasa de interés: {self.tasa_interes*100}%"
+        return f"Cuenta de Ahorro - Número: {self.numero_cuenta}, Titular: {self.titular}, Saldo: ${self.saldo:.2f}, Tasa de interés: {self.tasa_interes*100}%"
+
+DURABILIDADES = ('inmediata', 'lote', 'diferida')
+
+CAMPOS_EN_CENTAVOS = ('saldo_centavos', 'limite_sobregiro_centavos')
 
 class SistemaBancario:
-    def __init__(self):
+    def __init__(self, franjas=64, umbral_compactacion=10000, durabilidad='inmediata', tamano_lote=64):
+        if durabilidad not in DURABILIDADES:
+            raise ValueError(f"Durabilidad no válida: {durabilidad}")
+        self._candados = [threading.Lock() for _ in range(franjas)]
+        self._candado_registro = threading.Lock()
+        self._sincronizacion = threading.Condition()
+        self._sincronizando = False
+        self._registro = None
+        self._ruta_registro = None
+        self._formato_registro = None
+        self._entradas_registro = 0
+        self._secuencia = 0
+        self._sincronizada = 0
+        self._columnas = None
+        self.umbral_compactacion = umbral_compactacion
+        self.durabilidad = durabilidad
+        self.tamano_lote = tamano_lote
         self.cuentas = []
 
+    @property
+    def cuentas(self):
+        return list(self._cuentas.values())
+
+    @cuentas.setter
+    def cuentas(self, cuentas):
+        registro, self._registro = self._registro, None
+        try:
+            self._cuentas = {}
+            self._columnas = None
+            for cuenta in cuentas:
+                self.crear_cuenta(cuenta)
+        finally:
+            self._registro = registro
+        if registro is not None:
+            self.compactar()
+
     def crear_cuenta(self, cuenta):
-        self.cuentas.append(cuenta)
+        secuencia = None
+        with self._candados[self._franja(cuenta.numero_cuenta)]:
+            if cuenta.numero_cuenta in self._cuentas:
+                raise ValueError(f"Ya existe una cuenta con el número {cuenta.numero_cuenta}")
+            self._cuentas[cuenta.numero_cuenta] = cuenta
+            self._columnas = None
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'crear', 'cuenta': cuenta.to_dict()})
+        self._confirmar(secuencia)
 
     def eliminar_cuenta(self, numero_cuenta):
-        self.cuentas = [c for c in self.cuentas if c.numero_cuenta != numero_cuenta]
+        secuencia = None
+        with self._candados[self._franja(numero_cuenta)]:
+            if self._cuentas.pop(numero_cuenta, None) is None:
+                return False
+            self._columnas = None
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'eliminar', 'cuenta': numero_cuenta})
+        self._confirmar(secuencia)
+        return True
 
     def actualizar_cuenta(self, numero_cuenta, **kwargs):
-        for cuenta in self.cuentas:
-            if cuenta.numero_cuenta == numero_cuenta:
-                for key, value in kwargs.items():
-                    if hasattr(cuenta, key):
-                        setattr(cuenta, key, value)
-                return True
-        return False
+        secuencia = None
+        with self._candados[self._franja(numero_cuenta)]:
+            cuenta = self._cuentas.get(numero_cuenta)
+            if cuenta is None:
+                return False
+            for campo in CAMPOS_EN_CENTAVOS:
+                if campo in kwargs:
+                    raise ValueError(f"El campo {campo} no se puede actualizar directamente")
+            cambios = {key: value for key, value in kwargs.items() if hasattr(cuenta, key)}
+            anterior = dict(vars(cuenta))
+            try:
+                for key, value in cambios.items():
+                    setattr(cuenta, key, value)
+            except Exception:
+                vars(cuenta).clear()
+                vars(cuenta).update(anterior)
+                raise
+            self._columnas = None
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'actualizar', 'cuenta': numero_cuenta, 'cambios': cambios})
+        self._confirmar(secuencia)
+        return True
 
     def buscar_cuenta(self, numero_cuenta):
-        return next((c for c in self.cuentas if c.numero_cuenta == numero_cuenta), None)
-
-    def guardar_en_json(self, filename):
-        with open(filename, 'w') as f:
-            json.dump([{**c.__dict__, 'tipo': c.__class__.__name__} for c in self.cuentas], f, default=str)
-
-    def cargar_desde_json(self, filename):
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        return self._cuentas.get(numero_cuenta)
+
+    def _cuenta(self, numero_cuenta):
+        cuenta = self._cuentas.get(numero_cuenta)
+        if cuenta is None:
+            raise ValueError(f"Cuenta no encontrada: {numero_cuenta}")
+        return cuenta
+
+    def _franja(self, numero_cuenta):
+        return hash(numero_cuenta) % len(self._candados)
+
+    def depositar(self, numero_cuenta, monto):
+        self.depositar_centavos(numero_cuenta, a_centavos(monto))
+
+    def retirar(self, numero_cuenta, monto):
+        self.retirar_centavos(numero_cuenta, a_centavos(monto))
+
+    def transferir(self, origen, destino, monto):
+        self.transferir_centavos(origen, destino, a_centavos(monto))
+
+    def depositar_centavos(self, numero_cuenta, centavos):
+        _validar_centavos(centavos)
+        secuencia = None
+        with self._candados[self._franja(numero_cuenta)]:
+            self._cuenta(numero_cuenta).depositar_centavos(centavos)
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'depositar', 'cuenta': numero_cuenta, 'centavos': centavos})
+        self._confirmar(secuencia)
+
+    def retirar_centavos(self, numero_cuenta, centavos):
+        _validar_centavos(centavos)
+        secuencia = None
+        with self._candados[self._franja(numero_cuenta)]:
+            self._cuenta(numero_cuenta).retirar_centavos(centavos)
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'retirar', 'cuenta': numero_cuenta, 'centavos': centavos})
+        self._confirmar(secuencia)
+
+    def transferir_centavos(self, origen, destino, centavos):
+        if origen == destino:
+            raise ValueError("La cuenta de origen y la de destino son la misma")
+        _validar_centavos(centavos)
+        secuencia = None
+        candados = [self._candados[i] for i in sorted({self._franja(origen), self._franja(destino)})]
+        for candado in candados:
+            candado.acquire()
+        try:
+            cuenta_origen = self._cuenta(origen)
+            cuenta_destino = self._cuenta(destino)
+            cuenta_origen.retirar_centavos(centavos)
+            cuenta_destino.depositar_centavos(centavos)
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'transferir', 'origen': origen, 'destino': destino, 'centavos': centavos})
+        finally:
+            for candado in reversed(candados):
+                candado.release()
+        self._confirmar(secuencia)
+
+    def liquidar_transferencias(self, transferencias):
+        return self.liquidar_transferencias_centavos(
+            (origen, destino, a_centavos(monto)) for origen, destino, monto in transferencias
+        )
+
+    def liquidar_transferencias_centavos(self, transferencias):
+        transferencias = list(transferencias)
+        fallas = []
+        netos = {}
+        for indice, (origen, destino, centavos) in enumerate(transferencias):
+            try:
+                if origen == destino:
+                    raise ValueError("La cuenta de origen y la de destino son la misma")
+                _validar_centavos(centavos)
+            except ValueError as e:
+                fallas.append((indice, str(e)))
+            else:
+                netos[origen] = netos.get(origen, 0) - centavos
+                netos[destino] = netos.get(destino, 0) + centavos
+        secuencia = None
+        candados = [self._candados[i] for i in sorted({self._franja(numero) for numero in netos})]
+        for candado in candados:
+            candado.acquire()
+        try:
+            cuentas = {numero: self._cuentas.get(numero) for numero in netos}
+            sin_fondos = {
+                numero for numero, neto in netos.items()
+                if cuentas[numero] is not None and cuentas[numero].saldo_centavos + neto < cuentas[numero].saldo_minimo_centavos()
+            }
+            if sin_fondos or None in cuentas.values():
+                invalidas = {indice for indice, _ in fallas}
+                for indice, (origen, destino, centavos) in enumerate(transferencias):
+                    if indice in invalidas:
+                        continue
+                    if cuentas[origen] is None or cuentas[destino] is None:
+                        numero = origen if cuentas[origen] is None else destino
+                        fallas.append((indice, f"Cuenta no encontrada: {numero}"))
+                    elif origen in sin_fondos:
+                        fallas.append((indice, f"Fondos insuficientes en la cuenta {origen}"))
+            if fallas:
+                return sorted(fallas)
+            movimientos = [[numero, neto] for numero, neto in netos.items() if neto]
+            for numero, neto in movimientos:
+                cuentas[numero].saldo_centavos += neto
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'liquidar', 'movimientos': movimientos})
+        finally:
+            for candado in reversed(candados):
+                candado.release()
+        self._confirmar(secuencia)
+        return fallas
+
+    def _bloquear_todo(self):
+        for candado in self._candados:
+            candado.acquire()
+
+    def _desbloquear_todo(self):
+        for candado in reversed(self._candados):
+            candado.release()
+
+    def _obtener_columnas(self):
+        if self._columnas is None:
+            cuentas = [c for c in self._cuentas.values() if isinstance(c, CuentaAhorro)]
+            self._columnas = {
+                'cuentas': cuentas,
+                'tasas': array('q', (round(c.tasa_interes * ESCALA_TASA) for c in cuentas)),
+                'factores': {},
+            }
+        return self._columnas
+
+    def aplicar_intereses(self, periodos=1):
+        if periodos < 0:
+            raise ValueError("El número de periodos no puede ser negativo")
+        secuencia = None
+        self._bloquear_todo()
+        try:
+            columnas = self._obtener_columnas()
+            factores = columnas['factores'].get(periodos)
+            if factores is None:
+                factores = [(ESCALA_TASA + tasa) ** periodos for tasa in columnas['tasas']]
+                columnas['factores'][periodos] = factores
+            escala = ESCALA_TASA ** periodos
+            for cuenta, factor in zip(columnas['cuentas'], factores):
+                cuenta.saldo_centavos = dividir_redondeando(cuenta.saldo_centavos * factor, escala)
+            if self._registro is not None:
+                secuencia = self._registrar({'op': 'interes', 'periodos': periodos})
+        finally:
+            self._desbloquear_todo()
+        self._confirmar(secuencia)
+
+    def _ejecutar(self, operaciones):
+        resultados = []
+        for operacion, *argumentos in operaciones:
+            try:
+                if operacion not in OPERACIONES:
+                    raise ValueError(f"Operación no válida: {operacion}")
+                getattr(self, operacion)(*argumentos)
+                resultados.append(True)
+            except (ValueError, TypeError, ArithmeticError):
+                resultados.append(False)
+        return resultados
+
+    def ejecutar_lote(self, operaciones, trabajadores=4, tamano_tanda=256):
+        operaciones = list(operaciones)
+        tandas = [operaciones[i:i + tamano_tanda] for i in range(0, len(operaciones), tamano_tanda)]
+        with ThreadPoolExecutor(max_workers=trabajadores) as ejecutor:
+            return [resultado for resultados in ejecutor.map(self._ejecutar, tandas) for resultado in resultados]
+
+    def abrir_registro(self, filename, formato=None):
+        self.cerrar_registro()
+        if os.path.exists(filename) or os.path.exists(filename + '.log'):
+            self.cargar_desde_json(filename, formato)
+        else:
             self.cuentas = []
-            for item in data:
-                if item['tipo'] == 'CuentaCorriente':
-                    self.cuentas.append(CuentaCorriente(item['numero_cuenta'], item['titular'], item['saldo'], item['limite_sobregiro']))
-                elif item['tipo'] == 'CuentaAhorro':
-                    self.cuentas.append(CuentaAhorro(item['numero_cuenta'], item['titular'], item['saldo'], item['tasa_interes']))
+        self._ruta_registro = filename
+        self._formato_registro = formato_de(filename, formato)
+        self._registro = open(filename + '.log', 'a')
+        if self._registro.tell():
+            self.compactar()
+
+    def cerrar_registro(self):
+        if self._registro is not None:
+            with self._candado_registro:
+                self._registro.flush()
+                os.fsync(self._registro.fileno())
+                self._registro.close()
+                self._registro = None
+            self._marcar_sincronizada(self._secuencia)
+        self._ruta_registro = None
+        self._formato_registro = None
+        self._entradas_registro = 0
+
+    def _registrar(self, entrada):
+        with self._candado_registro:
+            self._secuencia += 1
+            entrada['seq'] = self._secuencia
+            self._registro.write(json.dumps(entrada) + '\n')
+            self._entradas_registro += 1
+            if self.durabilidad == 'lote' and self._secuencia - self._sincronizada >= self.tamano_lote:
+                self._registro.flush()
+                os.fsync(self._registro.fileno())
+                self._sincronizada = self._secuencia
+            return self._secuencia
+
+    def _confirmar(self, secuencia):
+        if secuencia is None:
+            return
+        if self.durabilidad == 'inmediata':
+            self._esperar_sincronizacion(secuencia)
+        if self._entradas_registro >= self.umbral_compactacion and self._registro is not None:
+            self.compactar()
+
+    def _esperar_sincronizacion(self, secuencia):
+        with self._sincronizacion:
+            while self._sincronizada < secuencia:
+                if self._sincronizando:
+                    self._sincronizacion.wait()
+                    continue
+                self._sincronizando = True
+                self._sincronizacion.release()
+                try:
+                    with self._candado_registro:
+                        if self._registro is None:
+                            objetivo = self._secuencia
+                            descriptor = None
+                        else:
+                            self._registro.flush()
+                            objetivo = self._secuencia
+                            descriptor = os.dup(self._registro.fileno())
+                    if descriptor is not None:
+                        try:
+                            os.fsync(descriptor)
+                        finally:
+                            os.close(descriptor)
+                finally:
+                    self._sincronizacion.acquire()
+                    self._sincronizando = False
+                self._sincronizada = max(self._sincronizada, objetivo)
+                self._sincronizacion.notify_all()
+
+    def _marcar_sincronizada(self, secuencia):
+        with self._sincronizacion:
+            self._sincronizada = secuencia
+            self._sincronizacion.notify_all()
+
+    def _reproducir_registro(self, filename, desde):
+        entradas = 0
+        with open(filename, 'r') as f:
+            for linea in f:
+                try:
+                    entrada = json.loads(linea)
+                except json.JSONDecodeError:
+                    break
+                if entrada['seq'] <= desde:
+                    continue
+                try:
+                    self._aplicar(entrada)
+                except ValueError:
+                    pass
+                self._secuencia = entrada['seq']
+                entradas += 1
+        return entradas
+
+    def _aplicar(self, entrada):
+        if entrada['op'] == 'crear':
+            self.crear_cuenta(_cuenta_desde_dict(entrada['cuenta']))
+        elif entrada['op'] == 'eliminar':
+            self.eliminar_cuenta(entrada['cuenta'])
+        elif entrada['op'] == 'actualizar':
+            self.actualizar_cuenta(entrada['cuenta'], **entrada['cambios'])
+        elif entrada['op'] == 'depositar':
+            self.depositar_centavos(entrada['cuenta'], _centavos_de(entrada))
+        elif entrada['op'] == 'retirar':
+            self.retirar_centavos(entrada['cuenta'], _centavos_de(entrada))
+        elif entrada['op'] == 'transferir':
+            self.transferir_centavos(entrada['origen'], entrada['destino'], _centavos_de(entrada))
+        elif entrada['op'] == 'liquidar':
+            for numero, neto in entrada['movimientos']:
+                self._cuenta(numero).saldo_centavos += neto
+        elif entrada['op'] == 'interes':
+            self.aplicar_intereses(entrada['periodos'])
+
+    def _instantanea(self):
+        return {'secuencia': self._secuencia, 'cuentas': [c.to_dict() for c in self.cuentas]}
+
+    def compactar(self):
+        if self._registro is None:
+            raise ValueError("No hay un registro de transacciones abierto")
+        self._bloquear_todo()
+        try:
+            with self._candado_registro:
+                escribir_registros(self._ruta_registro, self._instantanea(), self._formato_registro)
+                self._registro.flush()
+                self._registro.truncate(0)
+                self._entradas_registro = 0
+            self._marcar_sincronizada(self._secuencia)
+        finally:
+            self._desbloquear_todo()
+
+    def guardar_en_json(self, filename, formato=None):
+        if self._registro is not None and filename == self._ruta_registro:
+            with self._candado_registro:
+                self._registro.flush()
+                os.fsync(self._registro.fileno())
+            self._marcar_sincronizada(self._secuencia)
+        else:
+            self._bloquear_todo()
+            try:
+                instantanea = self._instantanea()
+            finally:
+                self._desbloquear_todo()
+            escribir_registros(filename, instantanea, formato)
+
+    def cargar_desde_json(self, filename, formato=None):
+        registro, self._registro = self._registro, None
+        entradas = 0
+        try:
+            self._cuentas = {}
+            self._columnas = None
+            self._secuencia = 0
+            if os.path.exists(filename) or not os.path.exists(filename + '.log'):
+                data = leer_registros(filename, formato)
+                if isinstance(data, dict):
+                    self._secuencia = data['secuencia']
+                    data = data['cuentas']
+                for item in data:
+                    cuenta = _cuenta_desde_dict(item)
+                    if cuenta is not None:
+                        self.crear_cuenta(cuenta)
+            if os.path.exists(filename + '.log'):
+                entradas = self._reproducir_registro(filename + '.log', self._secuencia)
+        finally:
+            self._registro = registro
+        self._entradas_registro = entradas
+        self._marcar_sincronizada(self._secuencia)
+        if registro is not None and filename != self._ruta_registro:
+            self.compactar()
+
+OPERACIONES = ('depositar', 'retirar', 'transferir', 'depositar_centavos', 'retirar_centavos', 'transferir_centavos')
+
+def _centavos_de(entrada):
+    if 'centavos' in entrada:
+        return entrada['centavos']
+    return a_centavos(entrada['monto'])
+
+def _cuenta_desde_dict(item):
+    if item['tipo'] == 'CuentaCorriente':
+        cuenta = CuentaCorriente(item['numero_cuenta'], item['titular'])
+        if 'limite_sobregiro_centavos' in item:
+            cuenta.limite_sobregiro_centavos = _validar_entero(item['limite_sobregiro_centavos'])
+        else:
+            cuenta.limite_sobregiro = item['limite_sobregiro']
+    elif item['tipo'] == 'CuentaAhorro':
+        cuenta = CuentaAhorro(item['numero_cuenta'], item['titular'], tasa_interes=item['tasa_interes'])
+    else:
+        return None
+    if 'saldo_centavos' in item:
+        cuenta.saldo_centavos = _validar_entero(item['saldo_centavos'])
+    else:
+        cuenta.saldo = item['saldo']
+    cuenta.fecha_apertura = item.get('fecha_apertura', cuenta.fecha_apertura)
+    return cuenta
+
+INSTRUMENTACION = Instrumentacion(
+    (CuentaBancaria, CuentaCorriente, CuentaAhorro, SistemaBancario),
+    ('leer_registros', 'escribir_registros', '_cuenta_desde_dict', 'a_centavos'),
+    globals(),
+)
+
+MAXIMO_ERRORES_LOTE = 20
+
+def _cuenta_de_lote(item):
+    cuenta = _cuenta_desde_dict(item)
+    if cuenta is None:
+        raise ValueError("Tipo de cuenta no válido")
+    return cuenta
+
+def _liquidar_de_lote(sistema, item):
+    fallas = sistema.liquidar_transferencias(item['transferencias'])
+    if fallas:
+        indice, motivo = fallas[0]
+        raise ValueError(f"{len(fallas)} transferencias rechazadas, la primera ({indice}): {motivo}")
+
+OPERACIONES_LOTE = {
+    'crear': lambda sistema, item: sistema.crear_cuenta(_cuenta_de_lote(item)),
+    'eliminar': lambda sistema, item: sistema.eliminar_cuenta(item['numero_cuenta']),
+    'actualizar': lambda sistema, item: sistema.actualizar_cuenta(item.pop('numero_cuenta'), **item),
+    'depositar': lambda sistema, item: sistema.depositar_centavos(item['numero_cuenta'], _centavos_de(item)),
+    'retirar': lambda sistema, item: sistema.retirar_centavos(item['numero_cuenta'], _centavos_de(item)),
+    'transferir': lambda sistema, item: sistema.transferir_centavos(item['origen'], item['destino'], _centavos_de(item)),
+    'liquidar': _liquidar_de_lote,
+    'intereses': lambda sistema, item: sistema.aplicar_intereses(item.get('periodos', 1)),
+}
+
+def procesar_lote(sistema, lineas):
+    resumen = {'operaciones': 0, 'exitosas': 0, 'fallidas': 0, 'errores': []}
+    inicio = time.perf_counter()
+    for numero, linea in enumerate(lineas, 1):
+        if not linea.strip():
+            continue
+        resumen['operaciones'] += 1
+        try:
+            item = json.loads(linea)
+            operacion = OPERACIONES_LOTE.get(item.pop('op', None))
+            if operacion is None:
+                raise ValueError("Operación no válida")
+            if operacion(sistema, item) is False:
+                raise ValueError("Cuenta no encontrada")
+            resumen['exitosas'] += 1
+        except Exception as e:
+            resumen['fallidas'] += 1
+            if len(resumen['errores']) < MAXIMO_ERRORES_LOTE:
+                resumen['errores'].append({'linea': numero, 'error': str(e)})
+    resumen['segundos'] = round(time.perf_counter() - inicio, 3)
+    return resumen
 
-def main():
+def menu():
     sistema = SistemaBancario()
 
     while True:
@@ -133,8 +828,10 @@ def main():
 
             elif opcion == '2':
                 numero_cuenta = input("Número de cuenta a eliminar: ")
-                sistema.eliminar_cuenta(numero_cuenta)
-                print("Cuenta eliminada con éxito")
+                if sistema.eliminar_cuenta(numero_cuenta):
+                    print("Cuenta eliminada con éxito")
+                else:
+                    print("Cuenta no encontrada")
 
             elif opcion == '3':
                 numero_cuenta = input("Número de cuenta a actualizar: ")
@@ -177,22 +874,14 @@ def main():
             elif opcion == '5':
                 numero_cuenta = input("Número de cuenta: ")
                 monto = float(input("Monto a depositar: "))
-                cuenta = sistema.buscar_cuenta(numero_cuenta)
-                if cuenta:
-                    cuenta.depositar(monto)
-                    print("Depósito realizado con éxito")
-                else:
-                    print("Cuenta no encontrada")
+                sistema.depositar(numero_cuenta, monto)
+                print("Depósito realizado con éxito")
 
             elif opcion == '6':
                 numero_cuenta = input("Número de cuenta: ")
                 monto = float(input("Monto a retirar: "))
-                cuenta = sistema.buscar_cuenta(numero_cuenta)
-                if cuenta:
-                    cuenta.retirar(monto)
-                    print("Retiro realizado con éxito")
-                else:
-                    print("Cuenta no encontrada")
+                sistema.retirar(numero_cuenta, monto)
+                print("Retiro realizado con éxito")
 
             elif opcion == '7':
                 for cuenta in sistema.cuentas:
@@ -217,5 +906,35 @@ def main():
         except Exception as e:
             print(f"Error inesperado: {e}")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de gestión de cuentas bancarias")
+    parser.add_argument('--lote', help="archivo JSON lines con una operación por línea ('-' para leer de stdin)")
+    parser.add_argument('--cargar', help="archivo a cargar antes de procesar el lote")
+    parser.add_argument('--guardar', help="archivo donde guardar al terminar el lote (si se omite, no se guarda nada)")
+    parser.add_argument('--perfil', action='store_true', help="mide llamadas y latencias y las muestra como JSON en stderr al terminar")
+    args = parser.parse_args(argv)
+    if args.perfil:
+        INSTRUMENTACION.activar()
+    if args.lote is None:
+        menu()
+    else:
+        _modo_lote(args)
+    if args.perfil:
+        print(json.dumps(INSTRUMENTACION.reporte()), file=sys.stderr)
+
+def _modo_lote(args):
+    sistema = SistemaBancario()
+    if args.cargar:
+        sistema.cargar_desde_json(args.cargar)
+    if args.lote == '-':
+        resumen = procesar_lote(sistema, sys.stdin)
+    else:
+        with open(args.lote) as f:
+            resumen = procesar_lote(sistema, f)
+    if args.guardar:
+        sistema.guardar_en_json(args.guardar)
+    resumen['registros'] = len(sistema.cuentas)
+    print(json.dumps(resumen))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,198 @@
+import importlib.util
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("cuentas_bancarias", Path(__file__).resolve().parents[1] / "main.py")
+main = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(main)
+
+
+def _sistema(**opciones):
+    sistema = main.SistemaBancario(franjas=8, **opciones)
+    sistema.crear_cuenta(main.CuentaAhorro("A", "Ana", 100))
+    sistema.crear_cuenta(main.CuentaCorriente("B", "Beto", 50, limite_sobregiro=20))
+    sistema.crear_cuenta(main.CuentaAhorro("C", "Caro", 0))
+    return sistema
+
+
+def _saldos(sistema):
+    return {cuenta.numero_cuenta: cuenta.saldo_centavos for cuenta in sistema.cuentas}
+
+
+def _abrir(ruta):
+    sistema = main.SistemaBancario(franjas=8)
+    sistema.abrir_registro(ruta)
+    return sistema
+
+
+def test_reproduccion_ignora_linea_final_cortada(tmp_path):
+    ruta = str(tmp_path / "cuentas.json")
+    sistema = _abrir(ruta)
+    sistema.crear_cuenta(main.CuentaAhorro("A", "Ana", 100))
+    sistema.crear_cuenta(main.CuentaAhorro("B", "Beto", 0))
+    sistema.transferir("A", "B", 30)
+    sistema.depositar("B", 5)
+    esperado = _saldos(sistema)
+    sistema.cerrar_registro()
+    with open(ruta + ".log", "a") as f:
+        f.write('{"op": "retirar", "cuenta": "A", "cent')
+
+    recuperado = _abrir(ruta)
+    assert _saldos(recuperado) == esperado
+    recuperado.depositar("A", 1)
+    recuperado.cerrar_registro()
+    assert _saldos(_abrir(ruta)) == {"A": 7100, "B": 3500}
+
+
+def test_instantanea_escrita_antes_de_truncar_no_duplica_entradas(tmp_path):
+    ruta = str(tmp_path / "cuentas.json")
+    sistema = _abrir(ruta)
+    sistema.crear_cuenta(main.CuentaAhorro("A", "Ana", 100))
+    sistema.crear_cuenta(main.CuentaAhorro("B", "Beto", 0))
+    sistema.transferir("A", "B", 25)
+    sistema.aplicar_intereses()
+    esperado = _saldos(sistema)
+    main.escribir_registros(ruta, sistema._instantanea())
+    sistema._registro.flush()
+    os.fsync(sistema._registro.fileno())
+    sistema._registro.close()
+    sistema._registro = None
+
+    assert os.path.getsize(ruta + ".log") > 0
+    assert _saldos(_abrir(ruta)) == esperado
+
+
+def test_liquidacion_rechazada_no_modifica_saldos_ni_registro(tmp_path):
+    ruta = str(tmp_path / "cuentas.json")
+    sistema = _abrir(ruta)
+    sistema.cuentas = _sistema().cuentas
+    antes = _saldos(sistema)
+    secuencia = sistema._secuencia
+
+    fallas = sistema.liquidar_transferencias([
+        ("A", "C", 60),
+        ("B", "C", 100),
+        ("A", "X", 1),
+        ("C", "C", 1),
+        ("A", "B", -5),
+    ])
+
+    assert [indice for indice, _ in fallas] == [1, 2, 3, 4]
+    assert _saldos(sistema) == antes
+    assert sistema._secuencia == secuencia
+    sistema.cerrar_registro()
+    assert _saldos(_abrir(ruta)) == antes
+
+
+def test_liquidacion_aceptada_aplica_netos():
+    sistema = _sistema()
+    assert sistema.liquidar_transferencias([("A", "B", 80), ("B", "C", 140), ("C", "A", 10)]) == []
+    assert _saldos(sistema) == {"A": 3000, "B": -1000, "C": 13000}
+
+
+@pytest.mark.parametrize("durabilidad", main.DURABILIDADES)
+def test_transferencias_concurrentes_conservan_el_dinero(tmp_path, durabilidad):
+    ruta = str(tmp_path / "cuentas.json")
+    sistema = main.SistemaBancario(franjas=4, durabilidad=durabilidad, umbral_compactacion=500)
+    sistema.abrir_registro(ruta)
+    numeros = [f"{i:03d}" for i in range(40)]
+    for numero in numeros:
+        sistema.crear_cuenta(main.CuentaAhorro(numero, "titular", 10))
+    total = sum(_saldos(sistema).values())
+    azar = random.Random(7)
+    operaciones = [
+        ("transferir_centavos", *azar.sample(numeros, 2), azar.randint(-50, 400))
+        for _ in range(5000)
+    ]
+
+    resultados = sistema.ejecutar_lote(operaciones, trabajadores=8, tamano_tanda=64)
+
+    assert len(resultados) == len(operaciones)
+    assert not any(r for r, (_, _, _, centavos) in zip(resultados, operaciones) if centavos <= 0)
+    assert sum(_saldos(sistema).values()) == total
+    assert all(saldo >= 0 for saldo in _saldos(sistema).values())
+    esperado = _saldos(sistema)
+    sistema.cerrar_registro()
+    assert _saldos(_abrir(ruta)) == esperado
+
+
+def test_montos_no_positivos_e_invalidos_se_rechazan():
+    sistema = _sistema()
+    antes = _saldos(sistema)
+    for operacion in (
+        lambda: sistema.depositar("A", 0),
+        lambda: sistema.retirar("A", -10),
+        lambda: sistema.transferir("A", "C", -10),
+        lambda: sistema.depositar("A", "diez"),
+    ):
+        with pytest.raises(ValueError):
+            operacion()
+    resultados = sistema.ejecutar_lote([
+        ("depositar", "A", "diez"),
+        ("depositar", "A", None),
+        ("depositar", "A"),
+        ("depositar", "A", 1),
+    ])
+    assert resultados == [False, False, False, True]
+    assert _saldos(sistema) == {**antes, "A": antes["A"] + 100}
+
+
+def test_actualizar_cuenta_es_todo_o_nada(tmp_path):
+    ruta = str(tmp_path / "cuentas.json")
+    sistema = _abrir(ruta)
+    sistema.cuentas = _sistema().cuentas
+    secuencia = sistema._secuencia
+    with pytest.raises(ValueError):
+        sistema.actualizar_cuenta("B", titular="Zoe", limite_sobregiro="x")
+    assert sistema.buscar_cuenta("B").titular == "Beto"
+    assert sistema.buscar_cuenta("B").limite_sobregiro_centavos == 2000
+    assert sistema._secuencia == secuencia
+    assert sistema.actualizar_cuenta("B", titular="Zoe", limite_sobregiro=30)
+    sistema.cerrar_registro()
+    copia = _abrir(ruta)
+    assert (copia.buscar_cuenta("B").titular, copia.buscar_cuenta("B").limite_sobregiro_centavos) == ("Zoe", 3000)
+
+
+def test_guardar_durante_transferencias_conserva_el_total(tmp_path):
+    sistema = main.SistemaBancario(franjas=4)
+    numeros = [f"{i:03d}" for i in range(20)]
+    for numero in numeros:
+        sistema.crear_cuenta(main.CuentaAhorro(numero, "titular", 10))
+    total = sum(_saldos(sistema).values())
+    azar = random.Random(3)
+    operaciones = [("transferir_centavos", *azar.sample(numeros, 2), azar.randint(1, 300)) for _ in range(20000)]
+    ruta = str(tmp_path / "copia.json")
+    with main.ThreadPoolExecutor(max_workers=1) as ejecutor:
+        lote = ejecutor.submit(sistema.ejecutar_lote, operaciones, 4, 16)
+        while not lote.done():
+            sistema.guardar_en_json(ruta)
+            copia = main.SistemaBancario()
+            copia.cargar_desde_json(ruta)
+            assert sum(_saldos(copia).values()) == total
+        lote.result()
+
+
+@pytest.mark.parametrize("centavos", [0.5, 1.7, 12.0, True, "100", None])
+def test_montos_en_centavos_deben_ser_enteros(centavos):
+    sistema = _sistema()
+    antes = _saldos(sistema)
+    for operacion in (
+        lambda: sistema.depositar_centavos("A", centavos),
+        lambda: sistema.retirar_centavos("A", centavos),
+        lambda: sistema.transferir_centavos("A", "C", centavos),
+        lambda: sistema.actualizar_cuenta("A", saldo_centavos=centavos),
+        lambda: sistema.actualizar_cuenta("B", limite_sobregiro_centavos=centavos),
+    ):
+        with pytest.raises(ValueError):
+            operacion()
+    fallas = sistema.liquidar_transferencias_centavos([("A", "C", 25), ("A", "B", centavos)])
+    assert [indice for indice, _ in fallas] == [1]
+    resumen = main.procesar_lote(sistema, [
+        f'{{"op": "depositar", "numero_cuenta": "A", "centavos": {main.json.dumps(centavos)}}}',
+    ])
+    assert resumen['fallidas'] == 1
+    assert _saldos(sistema) == antes
+    assert all(type(saldo) is int for saldo in antes.values())